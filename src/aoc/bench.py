@@ -0,0 +1,123 @@
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+import io
+import json
+from math import ceil
+from pathlib import Path
+from statistics import median
+from typing import NamedTuple
+
+from aoc.solver import DAYS, YEAR, Solver
+from aoc.types import PuzzlePart
+
+STEPS = ("parse_1", "part_1", "parse_2", "part_2")
+# Steps faster than this are too noisy to flag as regressions
+NOISE_FLOOR = 1e-3
+
+
+class Stats(NamedTuple):
+    min: float
+    median: float
+    p95: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float]):
+        ordered = sorted(samples)
+        p95_rank = ceil(len(ordered) * 0.95) - 1
+        return cls(ordered[0], median(ordered), ordered[p95_rank])
+
+
+type DayStats = dict[str, Stats]
+
+
+def bench_day(day: int, repeat: int, warmup: int, example: bool = False):
+    samples = {step: list[float]() for step in STEPS}
+    solver = Solver(day, example)
+    parts: tuple[PuzzlePart, ...] = (1, 2)
+
+    # Solutions may print debug output, which we don't want to time
+    with redirect_stdout(io.StringIO()):
+        for run in range(warmup + repeat):
+            for part in parts:
+                timings = solver.time_part(part)
+                if timings is None or run < warmup:
+                    continue
+                parse_time, solve_time = timings
+                samples[f"parse_{part}"].append(parse_time)
+                samples[f"part_{part}"].append(solve_time)
+
+    return {step: Stats.from_samples(times) for step, times in samples.items() if times}
+
+
+def load_baseline(path: Path) -> dict[int, DayStats]:
+    data = json.loads(path.read_text())
+    return {
+        int(day): {step: Stats(**stats) for step, stats in steps.items()}
+        for day, steps in data["days"].items()
+    }
+
+
+def save_baseline(path: Path, results: dict[int, DayStats], example: bool):
+    data = {
+        "year": YEAR,
+        "example": example,
+        "days": {
+            str(day): {step: stats._asdict() for step, stats in steps.items()}
+            for day, steps in results.items()
+        },
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def format_time(seconds: float):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(prog="aoc bench")
+    parser.add_argument("days", nargs="*", type=int, default=list(DAYS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--example", action="store_true")
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--baseline", type=Path, help="compare against a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown of the median time, relative to the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline) if args.baseline else {}
+    results = dict[int, DayStats]()
+    regressions = list[str]()
+
+    print(f"{'Day':>3}  {'Step':<7}  {'Min':>9}  {'Median':>9}  {'P95':>9}")
+    for day in args.days:
+        results[day] = bench_day(day, args.repeat, args.warmup, args.example)
+        for step, stats in results[day].items():
+            line = (
+                f"{day:>3}  {step:<7}  {format_time(stats.min):>9}  "
+                f"{format_time(stats.median):>9}  {format_time(stats.p95):>9}"
+            )
+            baseline_stats = baseline.get(day, {}).get(step)
+            if baseline_stats:
+                change = stats.median / baseline_stats.median - 1
+                line += f"  {change:+.1%}"
+                if change > args.threshold and stats.median >= NOISE_FLOOR:
+                    line += "  REGRESSION"
+                    regressions.append(f"day {day} {step}")
+            print(line)
+
+    if args.save:
+        save_baseline(args.save, results, args.example)
+
+    if regressions:
+        print(f"Regressions past {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
@@ -1,110 +1,207 @@
-from dataclasses import dataclass
+from array import array
+import os
+
 from aoc.geometry import MapCell, Point, GridMap, MapDirection
 from aoc.parsers import transform
 
-
-@dataclass
-class Guard:
-    position: Point
-    direction: MapDirection
-
-    def forward_position(self):
-        match self.direction:
-            case MapDirection.UP:
-                return self.position + Point(0, -1)
-            case MapDirection.DOWN:
-                return self.position + Point(0, 1)
-            case MapDirection.LEFT:
-                return self.position + Point(-1, 0)
-            case MapDirection.RIGHT:
-                return self.position + Point(1, 0)
-
-    def move_forward(self):
-        position = self.forward_position()
-        return Guard(position, self.direction)
-
-    def rotate_clockwise(self):
-        direction = self.direction.rotate_clockwise()
-        return Guard(self.position, direction)
-
-    def clone(self):
-        return Guard(self.position, self.direction)
-
-    def __hash__(self):
-        return hash((self.position, self.direction))
+# Clockwise, so turning right takes the guard to the next direction
+DIRECTIONS = (MapDirection.UP, MapDirection.RIGHT, MapDirection.DOWN, MapDirection.LEFT)
+# Number of processes that check the candidate obstacles in part 2
+JOBS_ENV_VARIABLE = "AOC_DAY06_JOBS"
 
 
 class World(GridMap):
     def __init__(self, input: str | None = None):
-        self.guard: Guard | None = None
-        self._history = set[Guard]()
+        self.guard: tuple[Point, MapDirection] | None = None
         super().__init__(input)
 
     def parse_cell(self, pos: Point, raw_value: str):
         for direction in MapDirection:
             if raw_value == direction.value:
-                self.guard = Guard(pos, direction)
+                self.guard = (pos, direction)
                 return MapCell.EMPTY
         return super().parse_cell(pos, raw_value)
 
-    def move_guard(self):
-        if not self.guard:
-            return False
 
-        self._history.add(self.guard)
-
-        next_pos = self.guard.forward_position()
-        if next_pos not in self._grid:
-            self.guard = None
-            return False
-
-        match self[next_pos]:
-            case MapCell.EMPTY:
-                self.guard = self.guard.move_forward()
+class Patrol:
+    """Jump tables that move the guard from one turn to the next.
+
+    Cells are dense indexes from World.index(), and directions are positions in
+    DIRECTIONS. stops[direction][cell] is where a guard walking from cell stops in
+    front of an obstacle, or -1 if it walks off the map.
+    """
+
+    def __init__(self, world: World):
+        if not world.guard:
+            raise ValueError("There is no guard in the lab")
+
+        width, height = world.width, world.height
+        self.width = width
+        self.size = width * height
+        self.steps = (-width, 1, width, -1)
+        guard_position, guard_direction = world.guard
+        self.start = world.index(guard_position)
+        self.start_direction = DIRECTIONS.index(guard_direction)
+
+        # By index, as cells() skips missing cells in ragged rows
+        is_obstacle = bytearray(
+            world.get(world.point_at(i)) == MapCell.OBSTACLE for i in range(self.size)
+        )
+        rows = [range(y * width, (y + 1) * width) for y in range(height)]
+        columns = [range(x, self.size, width) for x in range(width)]
+        # Each line of cells in the order the guard walks along it
+        lines_per_direction = (
+            [column[::-1] for column in columns],
+            rows,
+            columns,
+            [row[::-1] for row in rows],
+        )
+
+        self.stops = list[array[int]]()
+        for direction, lines in enumerate(lines_per_direction):
+            stops = array("i", [-1]) * self.size
+            for line in lines:
+                stop = -1
+                for cell in reversed(line):
+                    if is_obstacle[cell]:
+                        stop = cell - self.steps[direction]
+                    else:
+                        stops[cell] = stop
+            self.stops.append(stops)
+
+    def next_stop(self, cell: int, direction: int, obstacle: int = -1):
+        """Find where the guard stops, with an optional extra obstacle."""
+        stop = self.stops[direction][cell]
+        if obstacle < 0:
+            return stop
+
+        step = self.steps[direction]
+        if step in (1, -1):
+            on_line = obstacle // self.width == cell // self.width
+        else:
+            on_line = obstacle % self.width == cell % self.width
+        # The extra obstacle only matters if it's ahead of the guard, and no
+        # farther away than the natural stop
+        if on_line and (obstacle - cell) * step > 0:
+            if stop < 0 or (stop - obstacle) * step >= 0:
+                return obstacle - step
+        return stop
+
+    def segments(self, cell: int, direction: int):
+        """Yield (start, direction, end) for each straight walk of the guard.
+
+        The last walk ends in the last cell before the guard leaves the map.
+        """
+        while True:
+            stop = self.next_stop(cell, direction)
+            if stop < 0:
+                yield cell, direction, self._edge(cell, direction)
+                return
+            yield cell, direction, stop
+            cell, direction = stop, (direction + 1) % 4
+
+    def has_loop(self, cell: int, direction: int, obstacle: int = -1):
+        turns = bytearray(self.size * 4)
+        while True:
+            cell = self.next_stop(cell, direction, obstacle)
+            if cell < 0:
                 return False
-            case MapCell.OBSTACLE:
-                self.guard = self.guard.rotate_clockwise()
+            state = cell * 4 + direction
+            if turns[state]:
                 return True
+            turns[state] = True
+            direction = (direction + 1) % 4
+
+    def _edge(self, cell: int, direction: int):
+        y, x = divmod(cell, self.width)
+        match direction:
+            case 0:
+                return x
+            case 1:
+                return y * self.width + self.width - 1
+            case 2:
+                return self.size - self.width + x
+            case _:
+                return y * self.width
+
+
+type Candidate = tuple[int, int, int]
+
+_worker_patrol: Patrol | None = None
+
+
+def _init_worker(patrol: Patrol):
+    global _worker_patrol
+    _worker_patrol = patrol
+
+
+def _count_loops(patrol: Patrol, candidates: list[Candidate]):
+    return sum(1 for args in candidates if patrol.has_loop(*args))
+
+
+def _count_loops_in_worker(candidates: list[Candidate]):
+    assert _worker_patrol
+    return _count_loops(_worker_patrol, candidates)
+
+
+def candidate_obstacles(patrol: Patrol):
+    """Yield (cell, direction, obstacle) for each cell on the guard's path.
+
+    Each cell is yielded the first time the guard is about to enter it, with the
+    guard's state just before, as the obstacle couldn't change the walk up to there.
+    """
+    visited = bytearray(patrol.size)
+    visited[patrol.start] = True
+    for start, direction, end in patrol.segments(patrol.start, patrol.start_direction):
+        step = patrol.steps[direction]
+        for cell in range(start + step, end + step, step):
+            if not visited[cell]:
+                visited[cell] = True
+                yield cell - step, direction, cell
+
+
+def count_loops(patrol: Patrol, candidates: list[Candidate], jobs: int = 1):
+    """Count the candidates that trap the guard in a loop.
+
+    With more than one job, the candidates are split into chunks that are counted
+    independently by a process pool, so the total doesn't depend on the number of
+    workers. The patrol is sent to each worker once, when it starts. Checking a
+    real input inline takes a few hundredths of a second, well below the cost of
+    starting a pool, so part 2 only uses one when JOBS_ENV_VARIABLE asks for it.
+    """
+    if jobs == 1 or not candidates:
+        return _count_loops(patrol, candidates)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunk_size = -(-len(candidates) // (jobs * 4))
+    chunks = [
+        candidates[i : i + chunk_size] for i in range(0, len(candidates), chunk_size)
+    ]
+    with ProcessPoolExecutor(
+        jobs, initializer=_init_worker, initargs=(patrol,)
+    ) as pool:
+        return sum(pool.map(_count_loops_in_worker, chunks))
 
-    def visited_cells(self):
-        while self.guard:
-            self.move_guard()
-        return {entry.position for entry in self._history}
-
-    def clone(self):
-        clone = super().clone()
-        self._history = self._history.copy()
-        if self.guard:
-            clone.guard = self.guard.clone()
-        return clone
-
-    def has_loop(self):
-        while self.guard:
-            turned = self.move_guard()
-            if turned and self.guard in self._history:
-                return True
 
-        return False
+def default_jobs():
+    return int(os.environ.get(JOBS_ENV_VARIABLE, 1))
 
 
-@transform(World)
-def part_1(world: World):
-    return len(world.visited_cells())
+def parse_patrol(input: str):
+    return Patrol(World(input))
 
 
-@transform(World)
-def part_2(world: World):
-    targets = set[Point]()
-    checked_locations = set[Point]()
+@transform(parse_patrol)
+def part_1(patrol: Patrol):
+    visited = bytearray(patrol.size)
+    for start, direction, end in patrol.segments(patrol.start, patrol.start_direction):
+        step = patrol.steps[direction]
+        for cell in range(start, end + step, step):
+            visited[cell] = True
+    return sum(visited)
 
-    while world.guard:
-        pos = world.guard.forward_position()
-        if pos not in checked_locations and world.get(pos) == MapCell.EMPTY:
-            clone = world.clone()
-            clone[pos] = MapCell.OBSTACLE
-            if clone.has_loop():
-                targets.add(pos)
-            checked_locations.add(pos)
-        world.move_guard()
 
-    return len(targets)
+@transform(parse_patrol)
+def part_2(patrol: Patrol):
+    return count_loops(patrol, list(candidate_obstacles(patrol)), default_jobs())
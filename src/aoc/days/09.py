@@ -1,114 +1,109 @@
-from dataclasses import dataclass
-from typing import Iterable, NamedTuple
+from heapq import heappop, heappush
+from typing import NamedTuple
 from aoc.parsers import digits, transform
 
-
-class File(NamedTuple):
-    file_id: int
-    block_count: int
-
-
-@dataclass
-class FreeSpace:
-    block_count: int
-
-
-def expand_blocks(disk_map: list[int]):
-    expanded_map = list[int | None]()
-    for index, block_count in enumerate(disk_map):
-        file_id = index // 2 if index % 2 == 0 else None
-        expanded_map.extend([file_id] * block_count)
-    return expanded_map
-
-
-def expand_files(disk_map: list[int]):
-    disk = list[File | FreeSpace]()
-    for index, block_count in enumerate(disk_map):
-        file_id = index // 2 if index % 2 == 0 else None
-        if file_id is not None:
-            disk.append(File(file_id, block_count))
-        else:
-            disk.append(FreeSpace(block_count))
-    return disk
-
-
-def compact_filesystem(disk: list[int | None]):
-    result: list[int] = []
-    left = 0
-    right = len(disk) - 1
-
-    while left <= right:
-        file_id = disk[left]
-        if file_id is not None:
-            result.append(file_id)
-            left += 1
+# Disk map digits, and so the spans they describe, are at most this long
+MAX_SPAN_LENGTH = 9
+
+
+class Span(NamedTuple):
+    start: int
+    length: int
+
+
+def expand_spans(disk_map: list[int]):
+    """Split a disk map into file spans, indexed by file id, and free spans."""
+    files = list[Span]()
+    free = list[Span]()
+    position = 0
+    for index, length in enumerate(disk_map):
+        spans = files if index % 2 == 0 else free
+        spans.append(Span(position, length))
+        position += length
+    return files, free
+
+
+def run_checksum(file_id: int, start: int, length: int):
+    # file_id * (start + start + 1 + ... + start + length - 1)
+    return file_id * (start * length + length * (length - 1) // 2)
+
+
+def compact_checksum(disk_map: list[int]):
+    """Checksum the disk after moving single blocks from the end into the gaps.
+
+    A left cursor walks the files and gaps in order, while a right cursor takes
+    blocks off the last file not moved yet, so nothing is expanded to blocks.
+    """
+    total = 0
+    position = 0
+    right_id = (len(disk_map) - 1) // 2
+    right_remaining = disk_map[2 * right_id]
+
+    left_id = 0
+    while left_id < right_id:
+        length = disk_map[2 * left_id]
+        total += run_checksum(left_id, position, length)
+        position += length
+
+        gap = disk_map[2 * left_id + 1]
+        while gap and left_id < right_id:
+            moved = min(gap, right_remaining)
+            total += run_checksum(right_id, position, moved)
+            position += moved
+            gap -= moved
+            right_remaining -= moved
+            if not right_remaining:
+                right_id -= 1
+                right_remaining = disk_map[2 * right_id]
+        left_id += 1
+
+    if left_id == right_id:
+        # The blocks of the last file that weren't moved stay where they are
+        total += run_checksum(right_id, position, right_remaining)
+    return total
+
+
+def defrag(files: list[Span], free: list[Span]):
+    """Move each file, highest id first, to the leftmost free span that fits it.
+
+    Free span starts are kept in one min-heap per span length, so the leftmost fit
+    is the smallest head among the heaps for lengths that are large enough. Space
+    freed by a moved file is never reused, as all files left to move come before it.
+    """
+    free_starts = [list[int]() for _ in range(MAX_SPAN_LENGTH + 1)]
+    for span in free:
+        # Spans are in disk order, so each list is already a heap
+        free_starts[span.length].append(span.start)
+
+    moved = files.copy()
+    for file_id in reversed(range(len(files))):
+        start, length = files[file_id]
+        target_start, target_length = start, 0
+        for free_length in range(length, MAX_SPAN_LENGTH + 1):
+            starts = free_starts[free_length]
+            if starts and starts[0] < target_start:
+                target_start, target_length = starts[0], free_length
+        if not target_length:
             continue
-        else:
-            file_id = disk[right]
-            if file_id is not None:
-                result.append(file_id)
-                left += 1
-            right -= 1
-
-    return result
-
-
-def move_file(disk: list[File | FreeSpace], file: File, target_position: int):
-    old_pos = disk.index(file)
-    disk[old_pos] = FreeSpace(file.block_count)
-    target = disk[target_position]
-    if file.block_count == target.block_count:
-        disk[target_position] = file
-    else:
-        assert isinstance(target, FreeSpace)
-        disk.insert(target_position, file)
-        target.block_count -= file.block_count
-
-
-def defrag_file(disk: list[File | FreeSpace], file: File):
-    for position, target in enumerate(disk):
-        if isinstance(target, FreeSpace) and file.block_count <= target.block_count:
-            move_file(disk, file, position)
-            break
-        if target == file:
-            break
-
-
-def defrag(disk: list[File | FreeSpace]):
-    files = [file for file in reversed(disk) if isinstance(file, File)]
-
-    for file in files:
-        defrag_file(disk, file)
 
+        heappop(free_starts[target_length])
+        moved[file_id] = Span(target_start, length)
+        if target_length > length:
+            heappush(free_starts[target_length - length], target_start + length)
 
-def files_to_blocks(disk: list[File | FreeSpace]):
-    result = list[int | None]()
-    for item in disk:
-        match item:
-            case File(file_id, block_count):
-                result.extend([file_id] * block_count)
-            case FreeSpace(block_count):
-                result.extend([None] * block_count)
-    return result
+    return moved
 
 
-def checksum(expanded_map: Iterable[int | None]):
-    return sum(
-        index * file_id
-        for index, file_id in enumerate(expanded_map)
-        if file_id is not None
-    )
+def span_checksum(files: list[Span]):
+    return sum(run_checksum(file_id, *span) for file_id, span in enumerate(files))
 
 
 @transform(digits)
 def part_1(disk_map: list[int]):
-    disk = expand_blocks(disk_map)
-    compacted = compact_filesystem(disk)
-    return checksum(compacted)
+    return compact_checksum(disk_map)
 
 
 @transform(digits)
 def part_2(disk_map: list[int]):
-    disk = expand_files(disk_map)
-    defrag(disk)
-    return checksum(files_to_blocks(disk))
+    files, free = expand_spans(disk_map)
+    return span_checksum(defrag(files, free))
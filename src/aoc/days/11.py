@@ -1,34 +1,56 @@
-from functools import cache
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable
 
 from aoc.parsers import transform, numbers
 
 
-@cache
-def stone_count_after_transform(stone: int, iterations: int) -> int:
-    if iterations == 0:
-        return 1
+# Stones from any starting value settle into a few thousand distinct values, so a
+# bounded cache covers them without growing with the number of blinks
+@lru_cache(maxsize=4096)
+def transform_stone(stone: int) -> tuple[int, ...]:
+    if stone == 0:
+        return (1,)
 
-    new_stones = list[int]()
     stone_digits = str(stone)
     digit_count = len(stone_digits)
-
-    if stone == 0:
-        new_stones.append(1)
-    elif digit_count % 2 == 0:
+    if digit_count % 2 == 0:
         split_pos = digit_count // 2
-        new_stones.append(int(stone_digits[:split_pos]))
-        new_stones.append(int(stone_digits[split_pos:]))
-    else:
-        new_stones.append(stone * 2024)
+        return (int(stone_digits[:split_pos]), int(stone_digits[split_pos:]))
+
+    return (stone * 2024,)
+
+
+def blinks(stones: Iterable[int]):
+    """Yield the count of each stone value after every blink, forever."""
+    counts = Counter(stones)
+    while True:
+        next_counts = Counter[int]()
+        for stone, count in counts.items():
+            for new_stone in transform_stone(stone):
+                next_counts[new_stone] += count
+        counts = next_counts
+        yield counts
+
+
+def stone_count(stones: Iterable[int], iterations: int):
+    if iterations == 0:
+        return sum(1 for _ in stones)
+    counts = next(islice(blinks(stones), iterations - 1, None))
+    return counts.total()
+
 
-    return sum(stone_count_after_transform(s, iterations - 1) for s in new_stones)
+def distinct_stone_counts(stones: Iterable[int], iterations: int):
+    """Return the number of distinct stone values after each blink."""
+    return [len(counts) for counts in islice(blinks(stones), iterations)]
 
 
 @transform(numbers)
 def part_1(stones: list[int]):
-    return sum(stone_count_after_transform(stone, iterations=25) for stone in stones)
+    return stone_count(stones, iterations=25)
 
 
 @transform(numbers)
 def part_2(stones: list[int]):
-    return sum(stone_count_after_transform(stone, iterations=75) for stone in stones)
+    return stone_count(stones, iterations=75)
@@ -1,84 +1,72 @@
-from aoc.geometry import Line, Point, StringGrid
+from typing import NamedTuple
+
+from aoc.geometry import StringGrid
 from aoc.parsers import transform
 
 
-def fence_segment(outer: Point, inner: Point):
-    diff = outer - inner
-    match diff:
-        case Point(-1, 0):
-            return Line(inner + Point(0, 1), inner)
-        case Point(1, 0):
-            return Line(outer, outer + Point(0, 1))
-        case Point(0, -1):
-            return Line(inner, inner + Point(1, 0))
-        case Point(0, 1):
-            return Line(outer + Point(1, 0), outer)
-        case _:
-            raise ValueError(
-                "Cannot calculate fence segments for points that are "
-                f"not adjacent: {outer}, {inner}"
-            )
-
-
-def merge_fence_segments(segments: set[Line]):
-    sides = list[Line]()
-    for segment in segments:
-        direction = segment.direction()
-        same_line_sides = [side for side in sides if side.direction() == direction]
-        before = [side for side in same_line_sides if side.end == segment.start]
-        after = [side for side in same_line_sides if segment.end == side.start]
-        if before:
-            assert len(before) == 1
-            before[0].end = segment.end
-        if after:
-            assert len(after) == 1
-            after[0].start = segment.start
-        if before and after:
-            before[0].end = after[0].end
-            sides.remove(after[0])
-        if not before and not after:
-            sides.append(segment)
-    return sides
-
-
-def flood_fill(grid: StringGrid, start: Point):
-    perimeter = 0
-    region = set[Point]()
-    plant_type = grid[start]
-    fence_segments = set[Line]()
-
-    open_set = {start}
-    while open_set:
-        pos = open_set.pop()
-        region.add(pos)
-        for n in pos.neighbors():
-            if n not in grid or grid[n] != plant_type:
-                fence_segments.add(fence_segment(outer=n, inner=pos))
-                perimeter += 1
-            elif n not in region:
-                open_set.add(n)
-
-    sides = merge_fence_segments(fence_segments)
-
-    return region, perimeter, len(sides)
+class Region(NamedTuple):
+    area: int
+    perimeter: int
+    sides: int
 
 
 def find_regions(grid: StringGrid):
-    visited_locations = set[Point]()
-
-    for pos in grid.points():
-        if pos in visited_locations:
-            continue
-        region, perimeter, sides = flood_fill(grid, pos)
-        visited_locations.update(region)
-        yield region, perimeter, sides
+    """Measure every region from the 2x2 windows around each grid corner.
+
+    A window adds the cell below and to the right of its corner to that cell's
+    region, and a fence on each side of the corner that separates two regions. A
+    region has a corner of its boundary, so a side ends, where it covers one or
+    three cells of a window, and two corners where it covers two diagonal cells.
+    """
+    labels = grid.components()
+    region_count = max(labels, default=-1) + 1
+    areas = [0] * region_count
+    perimeters = [0] * region_count
+    corners = [0] * region_count
+
+    width, height = grid.width, grid.height
+
+    def label(x: int, y: int):
+        if 0 <= x < width and 0 <= y < height:
+            return labels[y * width + x]
+        return -1
+
+    for y in range(height + 1):
+        for x in range(width + 1):
+            top_left, top_right = label(x - 1, y - 1), label(x, y - 1)
+            bottom_left, bottom_right = label(x - 1, y), label(x, y)
+
+            if bottom_right >= 0:
+                areas[bottom_right] += 1
+            for neighbor in (bottom_left, top_right):
+                if neighbor != bottom_right:
+                    for region in (neighbor, bottom_right):
+                        if region >= 0:
+                            perimeters[region] += 1
+
+            for region in {top_left, top_right, bottom_left, bottom_right}:
+                if region < 0:
+                    continue
+                covered = (
+                    (top_left == region)
+                    + (top_right == region)
+                    + (bottom_left == region)
+                    + (bottom_right == region)
+                )
+                if covered % 2:
+                    corners[region] += 1
+                elif covered == 2 and (top_left == region) == (bottom_right == region):
+                    corners[region] += 2
+
+    for area, perimeter, sides in zip(areas, perimeters, corners):
+        yield Region(area, perimeter, sides)
 
 
 @transform(StringGrid)
 def part_1(grid: StringGrid):
-    return sum(perimeter * len(region) for region, perimeter, _ in find_regions(grid))
+    return sum(region.area * region.perimeter for region in find_regions(grid))
 
 
 @transform(StringGrid)
 def part_2(grid: StringGrid):
-    return sum(sides * len(region) for region, _, sides in find_regions(grid))
+    return sum(region.area * region.sides for region in find_regions(grid))
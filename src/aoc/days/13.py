@@ -47,9 +47,9 @@ def part_1(machines: list[Machine]):
     return sum(min_tokens_to_win(m) for m in machines)
 
 
-@transform(parse_machines)
+@transform(parse_machines, mutates_input=True)
 def part_2(machines: list[Machine]):
+    offset = Point(10_000_000_000_000, 10_000_000_000_000)
     for m in machines:
-        m.prize.x += 10_000_000_000_000
-        m.prize.y += 10000000000000
+        m.prize += offset
     return sum(min_tokens_to_win(m) for m in machines)
@@ -1,111 +1,131 @@
-from functools import reduce
+from array import array
+from functools import cached_property, reduce
 import operator
 import re
-from dataclasses import dataclass
 
-from aoc.geometry import Point
-from aoc.parsers import transform_lines
+from aoc.parsers import lines, transform
 
-robot_pattern = r"p=(\d+),(\d+) v=(-?\d+),(-?\d+)"
+robot_pattern = r"p=(-?\d+),(-?\d+) v=(-?\d+),(-?\d+)"
 
 WIDTH = 101
 HEIGHT = 103
 
 
-@dataclass
-class Robot:
-    position: Point
-    velocity: Point
+class Robots:
+    """Positions and velocities of all robots, one array per coordinate.
+
+    Robots move in a straight line and wrap around the edges, so the positions at
+    any time t are (p + v * t) mod (width, height), without simulating each step.
+    """
+
+    def __init__(self, width: int = WIDTH, height: int = HEIGHT):
+        self.width = width
+        self.height = height
+        self.px = array("i")
+        self.py = array("i")
+        self.vx = array("i")
+        self.vy = array("i")
 
     @classmethod
-    def from_line(cls, line: str):
-        match = re.match(robot_pattern, line)
-        if not match:
-            raise ValueError(f"Could not parse robot spec: {line}")
-        px, py, vx, vy = match.group(1, 2, 3, 4)
-        position = Point(int(px), int(py))
-        velocity = Point(int(vx), int(vy))
-        return cls(position, velocity)
-
-    def step(self):
-        new_pos = self.position + self.velocity
-        self.position = Point(new_pos.x % WIDTH, new_pos.y % HEIGHT)
-
-    def quadrant(self):
-        x, y = self.position.as_tuple()
-        if x < WIDTH // 2 and y < HEIGHT // 2:
-            return 0
-        if x < WIDTH // 2 and y > HEIGHT // 2:
-            return 1
-        if x > WIDTH // 2 and y < HEIGHT // 2:
-            return 2
-        if x > WIDTH // 2 and y > HEIGHT // 2:
-            return 3
-
-
-def move_robots(robots: list[Robot]):
-    for robot in robots:
-        robot.step()
-
-
-def safety_factor(robots: list[Robot]):
-    quadrants = [0] * 4
-    for robot in robots:
-        quadrant = robot.quadrant()
-        if quadrant is not None:
-            quadrants[quadrant] += 1
-    return reduce(operator.mul, quadrants)
-
-
-def is_xmas_tree(robots: list[Robot]):
-    # Simply check if an unusual number of robots are placed
-    # close together
-    robot_positions = {r.position for r in robots}
-    max_adjacent = 0
-    for x in range(WIDTH):
-        adjacent = 0
-        for y in range(HEIGHT):
-            if Point(x, y) in robot_positions:
-                adjacent += 1
-                max_adjacent = max(adjacent, max_adjacent)
-            else:
-                adjacent = 0
-    for y in range(WIDTH):
-        adjacent = 0
-        for x in range(HEIGHT):
-            if Point(x, y) in robot_positions:
-                adjacent += 1
-                max_adjacent = max(adjacent, max_adjacent)
-            else:
-                adjacent = 0
-    return max_adjacent > 10
-
-
-def print_robots(robots: list[Robot]):
-    robot_positions = {r.position for r in robots}
-    for y in range(HEIGHT):
-        line = list[str]()
-        for x in range(WIDTH):
-            if Point(x, y) in robot_positions:
-                line.append("#")
-            else:
-                line.append(".")
-        print("".join(line))
-
-
-@transform_lines(Robot.from_line)
-def part_1(robots: list[Robot]):
-    for _ in range(100):
-        move_robots(robots)
-    return safety_factor(robots)
-
-
-@transform_lines(Robot.from_line)
-def part_2(robots: list[Robot]):
-    steps = 0
-    while True:
-        move_robots(robots)
-        steps += 1
-        if is_xmas_tree(robots):
-            print_robots(robots)
-            return steps
+    def parse(cls, input: str, width: int = WIDTH, height: int = HEIGHT):
+        robots = cls(width, height)
+        for line in lines(input):
+            match = re.match(robot_pattern, line)
+            if not match:
+                raise ValueError(f"Could not parse robot spec: {line}")
+            px, py, vx, vy = map(int, match.group(1, 2, 3, 4))
+            robots.px.append(px)
+            robots.py.append(py)
+            robots.vx.append(vx)
+            robots.vy.append(vy)
+        return robots
+
+    def xs_at(self, t: int):
+        width = self.width
+        return array("i", [(p + v * t) % width for p, v in zip(self.px, self.vx)])
+
+    def ys_at(self, t: int):
+        height = self.height
+        return array("i", [(p + v * t) % height for p, v in zip(self.py, self.vy)])
+
+    def occupancy_at(self, t: int):
+        """Return a bitset of occupied cells, with bit y * width + x for (x, y)."""
+        width = self.width
+        cells = bytearray((width * self.height + 7) // 8)
+        for x, y in zip(self.xs_at(t), self.ys_at(t)):
+            index = y * width + x
+            cells[index >> 3] |= 1 << (index & 7)
+        return int.from_bytes(cells, "little")
+
+    def safety_factor(self, t: int):
+        mid_x, mid_y = self.width // 2, self.height // 2
+        quadrants = [0] * 4
+        for x, y in zip(self.xs_at(t), self.ys_at(t)):
+            if x != mid_x and y != mid_y:
+                quadrants[(x > mid_x) * 2 + (y > mid_y)] += 1
+        return reduce(operator.mul, quadrants)
+
+    def has_line(self, t: int, length: int):
+        """Check if length robots stand next to each other in a row or column."""
+        width, not_first_column = self.width, self._not_first_column
+        cells = self.occupancy_at(t)
+        # After n - 1 rounds, a bit is left for each run of n robots
+        rows, columns = cells, cells
+        for _ in range(length - 1):
+            rows &= (rows << 1) & not_first_column
+            columns &= columns << width
+        return bool(rows or columns)
+
+    @cached_property
+    def _not_first_column(self):
+        # Bits of the cells outside the first column, so that runs in a row don't
+        # wrap around from the previous row
+        row = sum(1 << x for x in range(1, self.width))
+        return row * sum(1 << (y * self.width) for y in range(self.height))
+
+    def render(self, t: int):
+        cells = self.occupancy_at(t)
+        return "\n".join(
+            "".join(
+                "#" if cells >> (y * self.width + x) & 1 else "."
+                for x in range(self.width)
+            )
+            for y in range(self.height)
+        )
+
+
+def spread(values: array[int]):
+    # Variance scaled by len(values) ** 2, which keeps it exact and in integers
+    return len(values) * sum(v * v for v in values) - sum(values) ** 2
+
+
+def easter_egg_time(robots: Robots):
+    """Find the first time the robots cluster together into a picture.
+
+    X positions repeat every width steps and Y positions every height steps, so
+    the picture is at the time with the least X spread within one X period, and
+    the least Y spread within one Y period. The Chinese remainder theorem then
+    gives the one time within width * height steps that matches both.
+    """
+    width, height = robots.width, robots.height
+    x_time = min(range(width), key=lambda t: spread(robots.xs_at(t)))
+    y_time = min(range(height), key=lambda t: spread(robots.ys_at(t)))
+
+    # t = x_time + width * k, with x_time + width * k = y_time (mod height)
+    k = (y_time - x_time) * pow(width, -1, height) % height
+    t = x_time + width * k
+    return t if t else width * height
+
+
+@transform(Robots.parse)
+def part_1(robots: Robots):
+    return robots.safety_factor(100)
+
+
+@transform(Robots.parse)
+def part_2(robots: Robots):
+    steps = easter_egg_time(robots)
+    if not robots.has_line(steps, length=11):
+        raise ValueError("The robots never line up into a picture")
+    print(robots.render(steps))
+    return steps
@@ -68,6 +68,7 @@ class WideWorld(Grid[WideMapCell]):
         self.robot: Point
         super().__init__()
         self.robot = Point(world.robot.x * 2, world.robot.y)
+        self.reserve((0, 0), (world.width * 2 - 1, world.height - 1))
         for pos, cell in world.cells():
             left = Point(pos.x * 2, pos.y)
             right = left + Point(1, 0)
@@ -93,11 +94,11 @@ class WideWorld(Grid[WideMapCell]):
         if cell == WideMapCell.EMPTY:
             self.robot = target_position
         elif cell in (WideMapCell.BOX_LEFT, WideMapCell.BOX_RIGHT):
-            old_grid = self._grid.copy()
+            old_cells = self._cells.copy()
             if self.move_boxes(target_position, direction):
                 self.robot = target_position
             else:
-                self._grid = old_grid
+                self._cells = old_cells
 
     def move_boxes(self, start: Point, direction: MapDirection):
         box_coords = self.get_box_coords(start)
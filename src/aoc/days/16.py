@@ -5,7 +5,7 @@ from typing import NamedTuple
 
 from aoc.geometry import Grid, MapDirection, Point
 from aoc.parsers import transform
-from aoc.search import a_star, cheapest_paths
+from aoc.search import BucketQueue, a_star, cheapest_paths
 
 
 class Cell(Enum):
@@ -89,6 +89,7 @@ def part_1(maze: Maze):
         partial(State.next_states, maze=maze),
         lambda state: state.position == goal,
         lambda state: state.position.manhattan_distance(goal),
+        frontier=BucketQueue,
     )
     if not path:
         raise ValueError("No path found")
@@ -110,10 +111,9 @@ def part_2(maze: Maze):
         start_state,
         partial(State.next_states, maze=maze),
         lambda state: state.position == goal,
+        frontier=BucketQueue,
     )
-    path_tiles = set[Point]()
-    for path in paths:
-        path_tiles.update(state.position for state in path)
+    path_tiles = {state.position for state in paths.states()}
 
     print_paths(path_tiles, maze)
     return len(path_tiles)
@@ -1,10 +1,10 @@
 from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import Literal
+from functools import cache
+from typing import Any, Callable, Literal
 
 from aoc.parsers import transform
 
-
 type Register = Literal["A", "B", "C"]
 Registers: list[Register] = ["A", "B", "C"]
 
@@ -89,39 +89,142 @@ class Computer:
         raise ValueError(f"Invalid combo operand {operand}")
 
 
-@transform(Computer.from_string)
-def part_1(computer: Computer):
-    computer.run()
-    return computer.string_output()
-
-
-def part_2(input: str):
-    computer = Computer.from_string(input)
+def _combo_source(operand: int):
+    if 0 <= operand <= 3:
+        return str(operand)
+    if 4 <= operand <= 6:
+        return Registers[operand - 4].lower()
+    raise ValueError(f"Invalid combo operand {operand}")
+
+
+def _instruction_source(instruction: int, operand: int):
+    # Registers never go negative, so dividing by 2 ** n is a right shift by n
+    match instruction:
+        case Opcode.adv:
+            return f"a >>= {_combo_source(operand)}"
+        case Opcode.bxl:
+            return f"b ^= {operand}"
+        case Opcode.bst:
+            return f"b = {_combo_source(operand)} & 7"
+        case Opcode.bxc:
+            return "b ^= c"
+        case Opcode.out:
+            return f"output.append({_combo_source(operand)} & 7)"
+        case Opcode.bdv:
+            return f"b = a >> {_combo_source(operand)}"
+        case Opcode.cdv:
+            return f"c = a >> {_combo_source(operand)}"
+        case _:
+            raise ValueError(f"Illegal opcode {instruction}")
+
+
+@cache
+def compile_program(program: tuple[int, ...]) -> Callable[[int, int, int], list[int]]:
+    """Compile a program into a Python function from registers A, B, C to output.
+
+    The program is split into blocks at the jumps and their targets. A program
+    ending in its only jump, back to the start, becomes a plain while loop, and
+    anything else becomes a loop that dispatches on the current block.
+    """
+    if len(program) % 2:
+        raise ValueError(f"Incomplete instruction in {program}")
+
+    jumps = {
+        i: program[i + 1] for i in range(0, len(program), 2) if program[i] == Opcode.jnz
+    }
+    if any(target % 2 for target in jumps.values()):
+        raise ValueError("Can't compile jumps into the middle of an instruction")
+
+    leaders = {0, *(t for t in jumps.values() if t < len(program))}
+    leaders.update(i + 2 for i in jumps if i + 2 < len(program))
+    starts = sorted(leaders)
+    block_ids = {start: block_id for block_id, start in enumerate(starts)}
+    # Jumping or falling off the end of the program halts it
+    halt = len(starts)
+
+    def block_body(start: int, end: int):
+        return [
+            _instruction_source(program[i], program[i + 1])
+            for i in range(start, end, 2)
+            if program[i] != Opcode.jnz
+        ]
+
+    lines = ["def run(a, b, c):", "    output = []"]
+    if list(jumps.items()) == [(len(program) - 2, 0)]:
+        lines.append("    while True:")
+        lines.extend(f"        {line}" for line in block_body(0, len(program)))
+        lines.append("        if not a:")
+        lines.append("            return output")
+    else:
+        lines.append("    block = 0")
+        lines.append("    while True:")
+        for block_id, (start, end) in enumerate(
+            zip(starts, starts[1:] + [len(program)])
+        ):
+            lines.append(f"        if block == {block_id}:")
+            lines.extend(f"            {line}" for line in block_body(start, end))
+            next_block = block_ids[end] if end < len(program) else halt
+            if end - 2 in jumps:
+                target = block_ids.get(jumps[end - 2], halt)
+                lines.append(f"            block = {target} if a else {next_block}")
+            else:
+                lines.append(f"            block = {next_block}")
+        lines.append(f"        if block == {halt}:")
+        lines.append("            return output")
+
+    namespace = dict[str, Any]()
+    exec("\n".join(lines), namespace)
+    return namespace["run"]
+
+
+def run_compiled(computer: Computer):
+    run = compile_program(computer.program)
+    return run(*(computer.registers.get(register, 0) for register in Registers))
 
-    def run(a: int):
-        c = Computer({"A": a}, computer.program)
-        c.run()
-        return c.output()
 
-    candidates = list[int]()
-    prefixes = [0]
-
-    for segment_index in range(4):
-        segment_start = -(segment_index + 1) * 4
-        program_segment = computer.program[segment_start:]
-        print(f"Getting candidates for {program_segment}")
-
-        for prefix in prefixes:
-            print(f"Checking prefix {oct(prefix)}")
+@transform(Computer.from_string)
+def part_1(computer: Computer):
+    return ",".join(str(value) for value in run_compiled(computer))
+
+
+def a_shift(program: tuple[int, ...]):
+    """Return the number of bits the program shifts out of A on each loop."""
+    shifts = [
+        program[i + 1]
+        for i in range(0, len(program), 2)
+        if program[i] == Opcode.adv and program[i + 1] <= 3
+    ]
+    if len(shifts) != 1:
+        raise ValueError("Expected A to be shifted by a constant once per loop")
+    return shifts[0]
+
+
+def find_quine_input(program: tuple[int, ...], bits: int = 3):
+    """Find the lowest A for which the program outputs itself.
+
+    The program must shift bits out of A on each loop, with B and C derived from
+    A, so that the last outputs only depend on the highest bits of A. A is built
+    from its most significant end, a group of bits at a time, and each extension
+    must output a longer suffix of the program. Trying the lowest bits first in a
+    depth first search makes the first full match the lowest.
+    """
+    run = compile_program(program)
+
+    def search(a: int, matched: int) -> int | None:
+        if matched == len(program):
+            return a
+        suffix = list(program[-(matched + 1) :])
+        for low_bits in range(1 << bits):
+            candidate = a << bits | low_bits
+            if run(candidate, 0, 0) == suffix:
+                result = search(candidate, matched + 1)
+                if result is not None:
+                    return result
+        return None
+
+    return search(0, 0)
 
-            for a_suffix in range(0o1000, 0o10000):
-                a = prefix + a_suffix
-                output = run(a)
-                if output == program_segment:
-                    print(f"run({oct(a)}) = {output}")
-                    candidates.append(a * 4096)
-                if output == computer.program:
-                    return a
 
-        prefixes = candidates
-        candidates = []
+@transform(Computer.from_string)
+def part_2(computer: Computer):
+    return find_quine_input(computer.program, a_shift(computer.program))
@@ -1,10 +1,10 @@
 from aoc.geometry import GridMap, MapCell, Point
 from aoc.parsers import transform_lines
-from aoc.search import a_star
 
 
 def get_empty_grid(size: int):
     grid = GridMap()
+    grid.reserve((0, 0), (size - 1, size - 1))
     for y in range(size):
         for x in range(size):
             grid[(x, y)] = MapCell.EMPTY
@@ -19,35 +19,17 @@ def part_1(positions: list[Point]):
         grid[pos] = MapCell.OBSTACLE
 
     goal = Point(70, 70)
+    distances = grid.empty_distances([Point(0, 0)], target=goal)
 
-    path = a_star(
-        start=Point(0, 0),
-        next_states=lambda pos: ((n, 1) for n in grid.empty_neighbors(pos)),
-        is_goal=lambda pos: pos == goal,
-        h=goal.manhattan_distance,
-    )
-
-    return len(path) - 1
+    return distances[grid.index(goal)]
 
 
 @transform_lines(Point.parse)
 def part_2(positions: list[Point]):
     grid = get_empty_grid(71)
+    blocking = grid.first_disconnecting(positions, Point(0, 0), Point(70, 70))
+    if blocking is None:
+        raise ValueError("There are still open paths after dropping all the bytes")
 
-    for pos in positions[:1024]:
-        grid[pos] = MapCell.OBSTACLE
-
-    goal = Point(70, 70)
-
-    for byte in positions:
-        grid[byte] = MapCell.OBSTACLE
-        path = a_star(
-            start=Point(0, 0),
-            next_states=lambda pos: ((n, 1) for n in grid.empty_neighbors(pos)),
-            is_goal=lambda pos: pos == goal,
-            h=goal.manhattan_distance,
-        )
-        if not path:
-            return f"{byte.x},{byte.y}"
-
-    raise ValueError("There are still open paths after dropping all the bytes")
+    byte = positions[blocking]
+    return f"{byte.x},{byte.y}"
@@ -1,6 +1,5 @@
 from aoc.geometry import GridMap, MapCell, Point
 from aoc.parsers import transform
-from aoc.search import a_star
 
 
 class RaceTrack(GridMap):
@@ -19,15 +18,18 @@ class RaceTrack(GridMap):
         return super().parse_cell(pos, raw_value)
 
 
-def shortest_path(track: RaceTrack, start: Point | None = None):
-    if not start:
-        start = track.start
-    return a_star(
-        start=start,
-        next_states=lambda pos: ((n, 1) for n in track.empty_neighbors(pos)),
-        is_goal=lambda pos: pos == track.end,
-        h=track.end.manhattan_distance,
-    )
+def shortest_path(track: RaceTrack):
+    from_start = track.empty_distances([track.start])
+    from_end = track.empty_distances([track.end])
+    length = from_start[track.index(track.end)]
+
+    path = [
+        (track.point_at(index), distance)
+        for index, distance in enumerate(from_start)
+        if distance >= 0 and distance + from_end[index] == length
+    ]
+    path.sort(key=lambda step: step[1])
+    return path
 
 
 def find_cheats(path: list[tuple[Point, int]], max_cheat_length: int):
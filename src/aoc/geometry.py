@@ -1,16 +1,20 @@
 from abc import ABC, abstractmethod
+from array import array
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 from fractions import Fraction
 from functools import total_ordering
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable, NamedTuple, Sequence
 
 from aoc import parsers
+from aoc.graph import DisjointSet
 
 
-@total_ordering
-@dataclass
-class Point:
+NEIGHBOR_OFFSETS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+class Point(NamedTuple):
     x: int
     y: int
 
@@ -22,21 +26,11 @@ class Point:
         return (self.x, self.y)
 
     def neighbors(self):
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        return [self + Point(*d) for d in directions]
+        x, y = self
+        return [Point(x + dx, y + dy) for dx, dy in NEIGHBOR_OFFSETS]
 
     def manhattan_distance(self, other: "Point"):
-        diff = other - self
-        return abs(diff.x) + abs(diff.y)
-
-    def __hash__(self):
-        return hash(self.as_tuple())
-
-    def __eq__(self, other: Any):
-        return isinstance(other, Point) and self.as_tuple() == other.as_tuple()
-
-    def __lt__(self, other: Any):
-        return isinstance(other, Point) and self.as_tuple() < other.as_tuple()
+        return abs(other.x - self.x) + abs(other.y - self.y)
 
     def __add__(self, other: Any):
         if not isinstance(other, Point):
@@ -53,6 +47,8 @@ class Point:
             raise TypeError(f"Cannot multiply Point and {type(factor)}")
         return Point(self.x * factor, self.y * factor)
 
+    __rmul__ = __mul__
+
 
 type PointTuple = tuple[int, int]
 
@@ -97,57 +93,274 @@ class Line:
         )
 
 
+_MISSING: Any = object()
+
+
 class Grid[T](ABC):
+    """Grid of cells, stored densely row by row in a flat list.
+
+    The bounds grow as needed when cells are set outside of them, so grids can
+    still be built up incrementally. Cells inside the bounds that were never
+    set are treated as missing, just like absent keys in a dict.
+    """
+
     def __init__(self, input: str | None = None):
-        self._grid: dict[Point, T] = {}
+        self._min_x = 0
+        self._min_y = 0
+        self._width = 0
+        self._height = 0
+        self._cells: list[T] = []
         if not input:
             return
 
-        for y, line in enumerate(parsers.lines(input)):
-            for x, value in enumerate(line):
-                pos = Point(x, y)
-                self[(x, y)] = self.parse_cell(pos, value)
+        rows = parsers.lines(input)
+        # A trailing newline would otherwise add an empty row
+        while rows and not rows[-1]:
+            rows.pop()
+        if not rows:
+            return
+
+        self._width = max(len(row) for row in rows)
+        self._height = len(rows)
+        self._cells = [_MISSING] * (self._width * self._height)
+
+        index = 0
+        for y, row in enumerate(rows):
+            for x, value in enumerate(row):
+                self._cells[index + x] = self.parse_cell(Point(x, y), value)
+            index += self._width
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
 
     def set(self, point: Point | PointTuple, value: T):
-        if isinstance(point, tuple):
-            point = Point(*point)
-        self._grid[point] = value
+        offset = self._offset(point)
+        if offset < 0:
+            self._grow(point)
+            offset = self._offset(point)
+        self._cells[offset] = value
 
     def get(self, point: Point | PointTuple, default: T | None = None):
-        if isinstance(point, tuple):
-            point = Point(*point)
-        try:
-            return self[point]
-        except KeyError:
+        offset = self._offset(point)
+        if offset < 0:
             return default
+        value = self._cells[offset]
+        return default if value is _MISSING else value
 
     def points(self) -> Iterable[Point]:
-        return self._grid.keys()
+        return (point for point, _ in self.cells())
 
     def cells(self) -> Iterable[tuple[Point, T]]:
-        return self._grid.items()
+        cells = self._cells
+        width = self._width
+        for y in range(self._height):
+            offset = y * width
+            for x in range(width):
+                value = cells[offset + x]
+                if value is not _MISSING:
+                    yield Point(self._min_x + x, self._min_y + y), value
 
     def neighbors(self, point: Point):
-        return [p for p in point.neighbors() if p in self._grid]
+        px, py = point
+        x, y = px - self._min_x, py - self._min_y
+        width, height, cells = self._width, self._height, self._cells
+        result = list[Point]()
+        for dx, dy in NEIGHBOR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                if cells[ny * width + nx] is not _MISSING:
+                    result.append(Point(px + dx, py + dy))
+        return result
+
+    def index(self, point: Point | PointTuple):
+        """Return the position of a point in dense per-cell arrays like distances()."""
+        offset = self._offset(point)
+        if offset < 0:
+            raise KeyError(point)
+        return offset
+
+    def point_at(self, index: int):
+        y, x = divmod(index, self._width)
+        return Point(self._min_x + x, self._min_y + y)
+
+    def distances(
+        self,
+        sources: Iterable[Point | PointTuple],
+        passable: Callable[[T], bool] | None = None,
+        target: Point | PointTuple | None = None,
+    ):
+        """Find the number of steps from the nearest source to every cell.
+
+        Returns a dense array indexed by index(point), holding -1 for cells that
+        can't be reached. Only cells for which passable(value) is true are
+        entered. With a target, the search stops as soon as the target is reached.
+        """
+        size = len(self._cells)
+        is_open = bytearray(
+            value is not _MISSING and (passable is None or passable(value))
+            for value in self._cells
+        )
+        target_index = self._offset(target) if target is not None else -1
+
+        distances = array("i", [-1]) * size
+        queue = deque[int]()
+        for source in sources:
+            index = self._offset(source)
+            if index >= 0 and distances[index] < 0:
+                distances[index] = 0
+                queue.append(index)
+
+        while queue:
+            index = queue.popleft()
+            if index == target_index:
+                break
+            distance = distances[index] + 1
+            for neighbor in self._neighbor_indexes(index):
+                if is_open[neighbor] and distances[neighbor] < 0:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+
+        return distances
+
+    def components(self):
+        """Label the connected regions of equal neighboring cells.
+
+        Returns a dense array indexed by index(point), holding -1 for missing cells
+        and region labels from 0 up, numbered in the order the regions first appear
+        in row-major order.
+        """
+        width, cells = self._width, self._cells
+        size = len(cells)
+        regions = DisjointSet(size)
+        for index, value in enumerate(cells):
+            if value is _MISSING:
+                continue
+            if index % width and cells[index - 1] == value:
+                regions.union(index, index - 1)
+            if index >= width and cells[index - width] == value:
+                regions.union(index, index - width)
+
+        labels = array("i", [-1]) * size
+        root_labels = dict[int, int]()
+        for index, value in enumerate(cells):
+            if value is not _MISSING:
+                root = regions.find(index)
+                labels[index] = root_labels.setdefault(root, len(root_labels))
+        return labels
 
     def clone(self):
         clone = type(self)()
-        clone._grid = self._grid.copy()
+        clone._min_x = self._min_x
+        clone._min_y = self._min_y
+        clone._width = self._width
+        clone._height = self._height
+        clone._cells = self._cells.copy()
         return clone
 
     @abstractmethod
     def parse_cell(self, pos: Point, raw_value: str) -> T: ...
 
+    def _neighbor_indexes(self, index: int):
+        """Yield the dense indexes of the cells next to index, within the bounds."""
+        width = self._width
+        x = index % width
+        if index >= width:
+            yield index - width
+        if index + width < len(self._cells):
+            yield index + width
+        if x > 0:
+            yield index - 1
+        if x < width - 1:
+            yield index + 1
+
+    def _offset(self, point: Point | PointTuple):
+        """Return the position of a point in the cell list, or -1 if out of bounds."""
+        x, y = point
+        x -= self._min_x
+        y -= self._min_y
+        if 0 <= x < self._width and 0 <= y < self._height:
+            return y * self._width + x
+        return -1
+
+    def reserve(self, top_left: Point | PointTuple, bottom_right: Point | PointTuple):
+        """Grow the bounds to cover a rectangle up front, without setting any cells.
+
+        Grids built cell by cell can call this first, so they don't grow repeatedly.
+        """
+        min_x, min_y = top_left
+        max_x, max_y = bottom_right
+        if self._cells:
+            min_x = min(min_x, self._min_x)
+            min_y = min(min_y, self._min_y)
+            max_x = max(max_x, self._min_x + self._width - 1)
+            max_y = max(max_y, self._min_y + self._height - 1)
+        self._resize(min_x, min_y, max_x, max_y)
+
+    def _grow(self, point: Point | PointTuple):
+        x, y = point
+        if not self._cells:
+            self._resize(x, y, x, y)
+            return
+
+        # Grow at least by the current size on each side that needs to grow, so
+        # that filling a grid one cell at a time takes amortised constant time
+        width, height = self._width, self._height
+        min_x, min_y = self._min_x, self._min_y
+        max_x, max_y = min_x + width - 1, min_y + height - 1
+        if x < min_x:
+            min_x = min(x, min_x - width)
+        elif x > max_x:
+            max_x = max(x, max_x + width)
+        if y < min_y:
+            min_y = min(y, min_y - height)
+        elif y > max_y:
+            max_y = max(y, max_y + height)
+        self._resize(min_x, min_y, max_x, max_y)
+
+    def _resize(self, min_x: int, min_y: int, max_x: int, max_y: int):
+        width = max_x - min_x + 1
+        height = max_y - min_y + 1
+        cells: list[T] = [_MISSING] * (width * height)
+        for row in range(self._height):
+            old_offset = row * self._width
+            new_offset = (self._min_y + row - min_y) * width + self._min_x - min_x
+            cells[new_offset : new_offset + self._width] = self._cells[
+                old_offset : old_offset + self._width
+            ]
+
+        self._min_x, self._min_y = min_x, min_y
+        self._width, self._height = width, height
+        self._cells = cells
+
     def __setitem__(self, point: Point | PointTuple, value: T):
         self.set(point, value)
 
     def __getitem__(self, point: Point | PointTuple):
-        if isinstance(point, tuple):
-            point = Point(*point)
-        return self._grid[point]
+        x, y = point
+        x -= self._min_x
+        y -= self._min_y
+        if 0 <= x < self._width and 0 <= y < self._height:
+            value = self._cells[y * self._width + x]
+            if value is not _MISSING:
+                return value
+        raise KeyError(point)
 
     def __contains__(self, item: Any):
-        return item in self._grid
+        if not isinstance(item, tuple):
+            return False
+        x, y = item
+        x -= self._min_x
+        y -= self._min_y
+        return (
+            0 <= x < self._width
+            and 0 <= y < self._height
+            and self._cells[y * self._width + x] is not _MISSING
+        )
 
 
 class StringGrid(Grid[str]):
@@ -218,6 +431,58 @@ class GridMap(Grid[MapCell]):
     def empty_neighbors(self, pos: Point):
         return (n for n in self.neighbors(pos) if self[n] == MapCell.EMPTY)
 
+    def empty_distances(self, sources: Iterable[Point], target: Point | None = None):
+        return self.distances(sources, lambda cell: cell == MapCell.EMPTY, target)
+
+    def first_disconnecting(
+        self, obstacles: Sequence[Point | PointTuple], start: Point, goal: Point
+    ):
+        """Find the position of the first obstacle that cuts start off from goal.
+
+        Obstacles are placed in order, and None is returned if start and goal are
+        still connected after placing all of them. Works backwards from the grid
+        with every obstacle placed, removing them newest first and joining each
+        freed cell with its empty neighbors, until start and goal end up in the
+        same region.
+        """
+        size = len(self._cells)
+        blocked_at = dict[int, int]()
+        for position, obstacle in enumerate(obstacles):
+            blocked_at.setdefault(self.index(obstacle), position)
+
+        is_open = bytearray(cell == MapCell.EMPTY for cell in self._cells)
+        for index in blocked_at:
+            is_open[index] = False
+
+        regions = DisjointSet(size)
+
+        def open_cell(index: int):
+            is_open[index] = True
+            for neighbor in self._neighbor_indexes(index):
+                if is_open[neighbor]:
+                    regions.union(index, neighbor)
+
+        for index in range(size):
+            if is_open[index]:
+                open_cell(index)
+
+        start_index, goal_index = self.index(start), self.index(goal)
+        if is_open[start_index] and regions.connected(start_index, goal_index):
+            return None
+
+        for position in range(len(obstacles) - 1, -1, -1):
+            index = self.index(obstacles[position])
+            if (
+                blocked_at[index] != position
+                or self[obstacles[position]] != MapCell.EMPTY
+            ):
+                continue
+            open_cell(index)
+            if is_open[start_index] and regions.connected(start_index, goal_index):
+                return position
+
+        raise ValueError(f"{start} and {goal} aren't connected without obstacles")
+
     def parse_cell(self, pos: Point, raw_value: str):
         for cell in MapCell:
             if raw_value == cell.value:
@@ -1,4 +1,5 @@
-from typing import Any
+from array import array
+from typing import Any, Callable
 
 from aoc.types import Comparable
 
@@ -24,33 +25,289 @@ class Edge[T: Comparable]:
         return value in self.nodes()
 
 
+class DisjointSet:
+    """Union-find over the integers 0 to size - 1."""
+
+    def __init__(self, size: int):
+        self._parents = list(range(size))
+        self._sizes = [1] * size
+
+    def find(self, item: int):
+        parents = self._parents
+        while parents[item] != item:
+            # Path halving: point every other node on the way to its grandparent
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+        return item
+
+    def union(self, item_a: int, item_b: int):
+        """Merge the sets of two items, returning False if they were already one."""
+        root_a, root_b = self.find(item_a), self.find(item_b)
+        if root_a == root_b:
+            return False
+        if self._sizes[root_a] < self._sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parents[root_b] = root_a
+        self._sizes[root_a] += self._sizes[root_b]
+        return True
+
+    def connected(self, item_a: int, item_b: int):
+        return self.find(item_a) == self.find(item_b)
+
+    def size(self, item: int):
+        return self._sizes[self.find(item)]
+
+
 class Graph[T: Comparable]:
+    """Undirected graph with an adjacency index over integer node ids.
+
+    Nodes are interned to ids in insertion order. Neighbor sets are kept per id
+    while the graph is built, and packed into CSR arrays (offsets into a flat
+    array of sorted neighbor ids) the first time they're read after a change.
+    """
+
     def __init__(self):
-        self._nodes = set[T]()
-        self._edges = set[Edge[T]]()
+        self._node_ids = dict[T, int]()
+        self._nodes = list[T]()
+        self._adjacency = list[set[int]]()
+        self._csr: tuple[array[int], array[int]] | None = None
 
     def add_edge(self, node_a: T, node_b: T):
         self.add_nodes(node_a, node_b)
-        edge = Edge(node_a, node_b)
-        if edge not in self._edges:
-            self._edges.add(edge)
+        id_a = self._node_ids[node_a]
+        id_b = self._node_ids[node_b]
+        if id_b not in self._adjacency[id_a]:
+            self._adjacency[id_a].add(id_b)
+            self._adjacency[id_b].add(id_a)
+            self._csr = None
 
     def add_nodes(self, *nodes: T):
-        self._nodes.update(nodes)
+        for node in nodes:
+            if node not in self._node_ids:
+                self._node_ids[node] = len(self._nodes)
+                self._nodes.append(node)
+                self._adjacency.append(set())
+                self._csr = None
 
     def has_edge(self, node_a: T, node_b: T):
-        e = Edge(node_a, node_b)
-        return e in self._edges
+        id_a = self._node_ids.get(node_a)
+        id_b = self._node_ids.get(node_b)
+        return id_a is not None and id_b in self._adjacency[id_a]
 
     def nodes(self):
-        return self._nodes
+        return self._node_ids.keys()
 
     def edges(self):
-        return self._edges
+        return {
+            Edge(self._nodes[id_a], self._nodes[id_b])
+            for id_a, neighbors in enumerate(self._adjacency)
+            for id_b in neighbors
+            if id_a <= id_b
+        }
+
+    def degree(self, node: T):
+        return len(self._adjacency[self._node_ids[node]])
 
     def neighbors(self, node: T):
-        for edge in self._edges:
-            if node in edge:
-                nodes = set(edge.nodes())
-                nodes.remove(node)
-                yield nodes.pop()
+        for neighbor_id in self.neighbor_ids(self._node_ids[node]):
+            yield self._nodes[neighbor_id]
+
+    def node_id(self, node: T):
+        return self._node_ids[node]
+
+    def node(self, node_id: int):
+        return self._nodes[node_id]
+
+    def neighbor_ids(self, node_id: int):
+        offsets, targets = self.csr()
+        return targets[offsets[node_id] : offsets[node_id + 1]]
+
+    def csr(self):
+        """Return the adjacency as (offsets, targets) arrays.
+
+        The neighbors of node id i are targets[offsets[i]:offsets[i + 1]], in
+        increasing id order.
+        """
+        if self._csr is None:
+            offsets = array("l", [0])
+            targets = array("l")
+            for neighbors in self._adjacency:
+                targets.extend(sorted(neighbors))
+                offsets.append(len(targets))
+            self._csr = (offsets, targets)
+        return self._csr
+
+
+# Clique algorithms work on bitsets, where bit i of an int stands for the node
+# at position i of a vertex ordering, and masks[i] holds the neighbors of that
+# node
+
+
+def _bits(mask: int):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def degeneracy_order[T: Comparable](graph: Graph[T]):
+    """Order node ids by repeatedly removing a node of minimum remaining degree.
+
+    Every node has at most d neighbors later in the order, where d is the
+    degeneracy of the graph.
+    """
+    node_count = len(graph.nodes())
+    degrees = [len(graph.neighbor_ids(i)) for i in range(node_count)]
+    buckets = [set[int]() for _ in range(max(degrees, default=0) + 1)]
+    for node_id, degree in enumerate(degrees):
+        buckets[degree].add(node_id)
+
+    order = list[int]()
+    removed = [False] * node_count
+    min_degree = 0
+    for _ in range(node_count):
+        min_degree = max(min_degree - 1, 0)
+        while not buckets[min_degree]:
+            min_degree += 1
+        node_id = buckets[min_degree].pop()
+        order.append(node_id)
+        removed[node_id] = True
+        for neighbor in graph.neighbor_ids(node_id):
+            if not removed[neighbor]:
+                buckets[degrees[neighbor]].remove(neighbor)
+                degrees[neighbor] -= 1
+                buckets[degrees[neighbor]].add(neighbor)
+    return order
+
+
+def _ordered_masks[T: Comparable](graph: Graph[T], order: list[int]):
+    position = {node_id: i for i, node_id in enumerate(order)}
+    masks = list[int]()
+    for node_id in order:
+        mask = 0
+        for neighbor in graph.neighbor_ids(node_id):
+            mask |= 1 << position[neighbor]
+        masks.append(mask)
+    return masks
+
+
+def enumerate_maximal_cliques[T: Comparable](graph: Graph[T]):
+    """Yield every maximal clique, using Bron–Kerbosch with Tomita pivoting.
+
+    The outer level visits nodes in degeneracy order, so each subproblem only
+    has the neighbors of one node as candidates.
+    """
+    order = degeneracy_order(graph)
+    masks = _ordered_masks(graph, order)
+
+    def bron_kerbosch(clique: list[int], candidates: int, excluded: int):
+        if not candidates and not excluded:
+            yield clique
+            return
+        # Neighbors of the pivot are covered when branching on the pivot itself
+        # or on one of its non-neighbors
+        pivot = max(
+            _bits(candidates | excluded),
+            key=lambda node: (candidates & masks[node]).bit_count(),
+        )
+        for node in _bits(candidates & ~masks[pivot]):
+            yield from bron_kerbosch(
+                clique + [node], candidates & masks[node], excluded & masks[node]
+            )
+            candidates &= ~(1 << node)
+            excluded |= 1 << node
+
+    for node in range(len(order)):
+        later = masks[node] >> (node + 1) << (node + 1)
+        earlier = masks[node] & ((1 << node) - 1)
+        for clique in bron_kerbosch([node], later, earlier):
+            yield {graph.node(order[i]) for i in clique}
+
+
+def _color_classes(candidates: int, masks: list[int]):
+    """Greedily color candidates, returning (node, color) in increasing color."""
+    colored = list[tuple[int, int]]()
+    uncolored = candidates
+    color = 0
+    while uncolored:
+        color += 1
+        available = uncolored
+        while available:
+            lowest = available & -available
+            node = lowest.bit_length() - 1
+            colored.append((node, color))
+            uncolored ^= lowest
+            available &= ~lowest & ~masks[node]
+    return colored
+
+
+def max_clique[T: Comparable](graph: Graph[T]):
+    """Find a maximum clique with branch and bound.
+
+    A clique can't grow by more than the number of colors in a greedy coloring
+    of its candidates, so branches are cut as soon as that bound can't beat the
+    best clique so far.
+    """
+    # Nodes of high core number come first, which finds large cliques early
+    order = degeneracy_order(graph)[::-1]
+    masks = _ordered_masks(graph, order)
+    best = list[int]()
+
+    def expand(clique: list[int], candidates: int):
+        nonlocal best
+        for node, color in reversed(_color_classes(candidates, masks)):
+            if len(clique) + color <= len(best):
+                return
+            clique.append(node)
+            new_candidates = candidates & masks[node]
+            if new_candidates:
+                expand(clique, new_candidates)
+            elif len(clique) > len(best):
+                best = clique.copy()
+            clique.pop()
+            candidates &= ~(1 << node)
+
+    expand([], (1 << len(order)) - 1)
+    return {graph.node(order[i]) for i in best}
+
+
+def cliques_of_size[T: Comparable](
+    graph: Graph[T], size: int, where: Callable[[T], bool] | None = None
+):
+    """Yield every clique with exactly size nodes, each one exactly once.
+
+    Cliques are built in degeneracy order. With where, only cliques with a
+    matching node are produced: each is anchored on its first matching node, so
+    other matching nodes are only taken if they come later.
+    """
+    if size < 1:
+        raise ValueError(f"Invalid clique size {size}")
+
+    order = degeneracy_order(graph)
+    masks = _ordered_masks(graph, order)
+
+    def extend(clique: list[int], candidates: int):
+        if len(clique) == size:
+            yield tuple(graph.node(order[i]) for i in clique)
+            return
+        for node in _bits(candidates):
+            # Only extend with later nodes, so each clique is built in one order
+            later = masks[node] >> (node + 1) << (node + 1)
+            yield from extend(clique + [node], candidates & later)
+
+    if where is None:
+        for node in range(len(order)):
+            later = masks[node] >> (node + 1) << (node + 1)
+            yield from extend([node], later)
+        return
+
+    # Bits of the matching nodes up to and including each anchor
+    matched_so_far = 0
+    for node, node_id in enumerate(order):
+        if where(graph.node(node_id)):
+            matched_so_far |= 1 << node
+            yield from extend([node], masks[node] & ~matched_so_far)
+
+
+def triangles[T: Comparable](graph: Graph[T], where: Callable[[T], bool] | None = None):
+    return cliques_of_size(graph, 3, where)
@@ -0,0 +1,68 @@
+from argparse import ArgumentParser
+import re
+import subprocess
+import sys
+from typing import NamedTuple
+
+IMPORT_TIME_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure(modules: list[str]):
+    """Import modules in a fresh interpreter and collect its -X importtime log."""
+    # __import__ goes through the C import machinery, which is what -X importtime
+    # instruments; importlib.import_module would hide the requested modules
+    code = "\n".join(f"__import__({m!r})" for m in modules)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    import_times = list[ImportTime]()
+    for line in process.stderr.splitlines():
+        if match := IMPORT_TIME_PATTERN.match(line):
+            self_us, cumulative_us, indent, module = match.groups()
+            import_times.append(
+                ImportTime(module, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+    return import_times
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(
+        prog="aoc imports", description="Report import times of the aoc package"
+    )
+    parser.add_argument("day", nargs="?", type=int, help="also import this day")
+    args = parser.parse_args(argv)
+
+    modules = ["aoc.main"]
+    if args.day:
+        modules.append(f"aoc.days.{args.day:02}")
+    import_times = measure(modules)
+
+    total_us = sum(i.cumulative_us for i in import_times if i.depth == 0)
+    # A requested module that was already imported as a dependency of an
+    # earlier one shows up again as an (empty) top-level entry, so keep the
+    # first entry of each module
+    project_modules = dict[str, ImportTime]()
+    for i in import_times:
+        if i.module.split(".")[0] == "aoc":
+            project_modules.setdefault(i.module, i)
+    project_times = sorted(
+        project_modules.values(), key=lambda i: i.cumulative_us, reverse=True
+    )
+
+    print(f"{'Module':<20} {'Self':>9} {'Cumulative':>11}")
+    for i in project_times:
+        self_ms, cumulative_ms = i.self_us / 1000, i.cumulative_us / 1000
+        print(f"{i.module:<20} {self_ms:>7.2f}ms {cumulative_ms:>9.2f}ms")
+    print(f"Total import time: {total_us / 1000:.2f}ms")
+    return 0
@@ -1,11 +1,16 @@
 from argparse import ArgumentParser
 from datetime import datetime
+from pathlib import Path
+import sys
+from typing import Literal
 
-from aoc.solver import solve
+from aoc.solver import DAYS, solve, solve_days
 from aoc.types import PuzzlePart
 
 
-def puzzle_day(value: str):
+def puzzle_day(value: str) -> int | Literal["all"]:
+    if value == "all":
+        return value
     if value:
         return int(value)
     else:
@@ -24,13 +29,45 @@ def puzzle_part(value: str) -> PuzzlePart | None:
 
 
 def main():
+    # Subcommands are imported on demand to keep startup fast
+    match sys.argv[1:2]:
+        case ["bench"]:
+            from aoc import bench
+
+            sys.exit(bench.main(sys.argv[2:]))
+        case ["imports"]:
+            from aoc import importtime
+
+            sys.exit(importtime.main(sys.argv[2:]))
+
     parser = ArgumentParser()
     parser.add_argument("day", nargs="?", default="", type=puzzle_day)
     parser.add_argument("part", nargs="?", default="", type=puzzle_part)
     parser.add_argument("--example", action="store_true")
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="worker processes when solving all days"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="profile parsing and each part"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help="write .pstats and collapsed stack files here when profiling",
+    )
     args = parser.parse_args()
+    if args.profile and args.day == "all":
+        parser.error("--profile needs a single day")
 
-    solve(args.day, args.part, args.example)
+    if args.profile:
+        from aoc.profiling import profile
+
+        profile(args.day, args.part, args.example, args.profile_dir)
+    elif args.day == "all":
+        solve_days(DAYS, args.example, args.jobs)
+    else:
+        solve(args.day, args.part, args.example)
 
 
 if __name__ == "__main__":
@@ -1,29 +1,40 @@
 from collections.abc import Callable
-from functools import wraps
+from functools import cache, wraps
 
 from aoc.types import Result
 
 
-def transform[T](parser: Callable[[str], T]):
+def transform[T](parser: Callable[[str], T], mutates_input: bool = False):
+    """Parse the input before passing it to a solution function.
+
+    The parser is exposed on the wrapper, so that the solver can parse the input
+    once and share it between the parts. Solutions that modify their input must
+    set mutates_input, and will get their own copy of the shared input.
+    """
+
     def make_wrapper(f: Callable[[T], Result]):
         @wraps(f)
         def wrapper(input: str):
             return f(parser(input))
 
+        wrapper.parser = parser  # type: ignore[attr-defined]
+        wrapper.mutates_input = mutates_input  # type: ignore[attr-defined]
         return wrapper
 
     return make_wrapper
 
 
-def transform_lines[T](parser: Callable[[str], T]):
-    def make_wrapper(f: Callable[[list[T]], Result]):
-        @wraps(f)
-        def wrapper(input: str):
-            return f([parser(line) for line in lines(input)])
+@cache
+def _line_parser[T](parser: Callable[[str], T]):
+    # Cached so every use of the same line parser shares one input parser
+    def parse_lines(input: str):
+        return [parser(line) for line in lines(input)]
 
-        return wrapper
+    return parse_lines
 
-    return make_wrapper
+
+def transform_lines[T](parser: Callable[[str], T], mutates_input: bool = False):
+    return transform(_line_parser(parser), mutates_input)
 
 
 def raw(input: str):
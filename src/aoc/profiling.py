@@ -0,0 +1,109 @@
+from contextlib import redirect_stdout
+from cProfile import Profile
+import io
+import os
+from pathlib import Path
+import pstats
+from typing import Any, Callable
+
+from aoc.solver import Solver
+from aoc.types import PuzzlePart
+
+# Only report functions defined in the aoc package
+AOC_FRAME_PATTERN = r"[/\\]aoc[/\\]"
+
+type FunctionKey = tuple[str, int, str]
+
+
+def profile_call[T](function: Callable[..., T], *args: Any) -> tuple[T, pstats.Stats]:
+    profiler = Profile()
+    # Solutions may print debug output, which would get mixed with the report
+    with redirect_stdout(io.StringIO()):
+        result = profiler.runcall(function, *args)
+    return result, pstats.Stats(profiler)
+
+
+def print_hot_paths(title: str, stats: pstats.Stats, limit: int):
+    for sort_key, description in (("cumulative", "cumulative"), ("tottime", "self")):
+        print(f"=== {title}: top functions by {description} time ===")
+        stats.sort_stats(sort_key).print_stats(AOC_FRAME_PATTERN, limit)
+
+
+def frame_name(function: FunctionKey):
+    filename, line, name = function
+    if filename == "~":
+        # Built-in function
+        return name
+    _, _, module_path = filename.rpartition(f"{os.sep}aoc{os.sep}")
+    return f"{module_path}:{line}({name})"
+
+
+def collapsed_stacks(stats: pstats.Stats):
+    """Approximate collapsed stacks for flame graphs from a cProfile call graph.
+
+    cProfile only records caller/callee pairs, so the time of a function is
+    split between the stacks leading to it in proportion to the time spent
+    along each incoming edge.
+    """
+    raw_stats: dict[FunctionKey, Any] = stats.stats  # type: ignore
+    callees = dict[FunctionKey, dict[FunctionKey, float]]()
+    roots = list[FunctionKey]()
+    for function, (_, _, _, _, callers) in raw_stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, (_, _, _, edge_time) in callers.items():
+            callees.setdefault(caller, {})[function] = edge_time
+
+    lines = list[str]()
+
+    def visit(function: FunctionKey, stack: list[FunctionKey], edge_time: float):
+        _, _, self_time, total_time, _ = raw_stats[function]
+        fraction = edge_time / total_time if total_time else 0
+        stack.append(function)
+        microseconds = round(self_time * fraction * 1e6)
+        if microseconds > 0:
+            frames = ";".join(frame_name(f) for f in stack)
+            lines.append(f"{frames} {microseconds}")
+        for callee, callee_time in callees.get(function, {}).items():
+            if callee not in stack:
+                visit(callee, stack, callee_time * fraction)
+        stack.pop()
+
+    for root in roots:
+        visit(root, [], raw_stats[root][3])
+    return lines
+
+
+def profile_part(solver: Solver, part: PuzzlePart, output_dir: Path | None, limit: int):
+    steps = solver.steps(part)
+    if not steps:
+        return
+
+    parsed_input, parse_stats = profile_call(steps.parse)
+    result, solve_stats = profile_call(steps.solve, parsed_input)
+    print(f"Part {part}: {result}")
+
+    for name, stats in ((f"parse{part}", parse_stats), (f"part{part}", solve_stats)):
+        print_hot_paths(name, stats, limit)
+        if output_dir:
+            stats.dump_stats(output_dir / f"{name}.pstats")
+            collapsed = collapsed_stacks(stats)
+            (output_dir / f"{name}.collapsed").write_text("\n".join(collapsed) + "\n")
+
+
+def profile(
+    day: int,
+    part: PuzzlePart | None,
+    example: bool = False,
+    output_dir: Path | None = None,
+    limit: int = 20,
+):
+    """Profile parsing and solving each part separately and print the hot paths."""
+    solver = Solver(day, example)
+    if output_dir:
+        output_dir = output_dir / f"day{day:02}"
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    parts: tuple[PuzzlePart, ...] = (part,) if part else (1, 2)
+    for p in parts:
+        profile_part(solver, p, output_dir, limit)
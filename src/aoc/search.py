@@ -1,6 +1,117 @@
 from heapq import heappop, heappush
+from itertools import count
 from math import inf
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Iterator, Protocol
+
+
+class Frontier[State](Protocol):
+    """Priority queue of states to expand, lowest priority first."""
+
+    def push(self, priority: int, state: State) -> None: ...
+
+    def pop(self) -> tuple[int, State]: ...
+
+    def __len__(self) -> int: ...
+
+
+class BinaryHeap[State]:
+    """General purpose frontier, which never compares the states themselves."""
+
+    def __init__(self):
+        self._heap = list[tuple[int, int, State]]()
+        # Breaks ties between equal priorities in insertion order
+        self._counter = count()
+
+    def push(self, priority: int, state: State):
+        heappush(self._heap, (priority, next(self._counter), state))
+
+    def pop(self):
+        priority, _, state = heappop(self._heap)
+        return priority, state
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class BucketQueue[State]:
+    """Dial's bucket queue, for integer priorities that never decrease.
+
+    Keeps one bucket per priority, so pushing and popping are O(1) apart from
+    skipping empty buckets, which is bounded by the largest priority overall.
+    Suited to searches with small integer edge costs and a consistent heuristic.
+    """
+
+    def __init__(self):
+        self._buckets = dict[int, list[State]]()
+        self._current = 0
+        self._size = 0
+
+    def push(self, priority: int, state: State):
+        if priority < self._current:
+            raise ValueError(
+                f"Priority {priority} is lower than the last popped {self._current}"
+            )
+        self._buckets.setdefault(priority, []).append(state)
+        self._size += 1
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("pop from empty bucket queue")
+        while self._current not in self._buckets:
+            self._current += 1
+        bucket = self._buckets[self._current]
+        state = bucket.pop()
+        if not bucket:
+            del self._buckets[self._current]
+        self._size -= 1
+        return self._current, state
+
+    def __len__(self):
+        return self._size
+
+
+class RadixHeap[State]:
+    """Radix heap, for integer priorities that never decrease.
+
+    Entries are bucketed by the highest bit in which their priority differs
+    from the last popped one, so each entry moves between buckets at most
+    once per bit of the priority range.
+    """
+
+    def __init__(self):
+        self._buckets = [list[tuple[int, State]]()]
+        self._last = 0
+        self._size = 0
+
+    def push(self, priority: int, state: State):
+        if priority < self._last:
+            raise ValueError(
+                f"Priority {priority} is lower than the last popped {self._last}"
+            )
+        self._bucket(priority).append((priority, state))
+        self._size += 1
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("pop from empty radix heap")
+        if not self._buckets[0]:
+            index = next(i for i, bucket in enumerate(self._buckets) if bucket)
+            bucket = self._buckets[index]
+            self._buckets[index] = []
+            self._last = min(priority for priority, _ in bucket)
+            for priority, state in bucket:
+                self._bucket(priority).append((priority, state))
+        self._size -= 1
+        return self._buckets[0].pop()
+
+    def _bucket(self, priority: int):
+        index = (priority ^ self._last).bit_length()
+        while index >= len(self._buckets):
+            self._buckets.append([])
+        return self._buckets[index]
+
+    def __len__(self):
+        return self._size
 
 
 def backtrack[State](
@@ -19,16 +130,21 @@ def a_star[State](
     next_states: Callable[[State], Iterable[tuple[State, int]]],
     is_goal: Callable[[State], bool],
     h: Callable[[State], int],
+    frontier: Callable[[], Frontier[State]] = BinaryHeap,
 ) -> list[tuple[State, int]]:
     f_costs = dict[State, int]()
     g_costs = dict[State, int]()
     f_costs[start] = h(start)
     g_costs[start] = 0
-    open_set = [(g_costs[start], start)]
+    open_set = frontier()
+    open_set.push(f_costs[start], start)
     came_from = dict[State, tuple[State, int]]()
 
     while open_set:
-        _, current = heappop(open_set)
+        f_cost, current = open_set.pop()
+        if f_cost > f_costs[current]:
+            # Stale entry, the state has been pushed again with a lower cost
+            continue
         if is_goal(current):
             total_cost = g_costs[current]
             return backtrack(came_from, current, total_cost)
@@ -39,43 +155,95 @@ def a_star[State](
                 g_costs[neighbor] = tentative_cost
                 f_costs[neighbor] = tentative_cost + h(neighbor)
                 came_from[neighbor] = (current, g_costs[current])
-                heappush(open_set, (f_costs[neighbor], neighbor))
+                open_set.push(f_costs[neighbor], neighbor)
 
     return []
 
 
+class PathDag[State]:
+    """All cheapest paths to a goal, as a DAG of optimal predecessors."""
+
+    def __init__(
+        self,
+        start: State,
+        goals: list[State],
+        predecessors: dict[State, list[State]],
+        cost: int | None,
+    ):
+        self.start = start
+        self.goals = goals
+        self.cost = cost
+        self._predecessors = predecessors
+
+    def states(self):
+        """Return every state that is part of at least one cheapest path."""
+        states = set(self.goals)
+        open_set = list(self.goals)
+        while open_set:
+            state = open_set.pop()
+            for predecessor in self._predecessors.get(state, []):
+                if predecessor not in states:
+                    states.add(predecessor)
+                    open_set.append(predecessor)
+        return states
+
+    def paths(self) -> Iterator[list[State]]:
+        """Enumerate the cheapest paths one at a time, from start to goal."""
+        for goal in self.goals:
+            open_set = [[goal]]
+            while open_set:
+                reversed_path = open_set.pop()
+                predecessors = self._predecessors.get(reversed_path[-1])
+                if not predecessors:
+                    yield reversed_path[::-1]
+                for predecessor in predecessors or []:
+                    open_set.append(reversed_path + [predecessor])
+
+    def __iter__(self):
+        return self.paths()
+
+    def __bool__(self):
+        return self.cost is not None
+
+
 def cheapest_paths[State](
     start: State,
     next_states: Callable[[State], Iterable[tuple[State, int]]],
     is_goal: Callable[[State], bool],
+    frontier: Callable[[], Frontier[State]] = BinaryHeap,
 ):
     """Find all cheapest paths to the goal."""
     costs = {start: 0}
-    open_set = [(0, start, [start])]
-    paths_to_goal = list[list[State]]()
+    predecessors = dict[State, list[State]]()
+    open_set = frontier()
+    open_set.push(0, start)
+    goals = list[State]()
     goal_cost = None
 
     while open_set:
-        cost, current, path = heappop(open_set)
+        cost, current = open_set.pop()
+        if cost > costs[current]:
+            # Stale entry, the state has been reached more cheaply since
+            continue
+        if goal_cost is not None and cost > goal_cost:
+            # Every remaining path is more expensive than the cheapest one
+            break
         if is_goal(current):
-            if goal_cost is None:
-                # We found the first possible path to the goal,
-                # which is guaranteed to be cheapest
-                goal_cost = cost
-                paths_to_goal.append(path)
-            elif cost == goal_cost:
-                # Another, equally good path
-                paths_to_goal.append(path)
-            else:
-                # Path must be more expensive and should be ignored
-                pass
+            # The first goal found is guaranteed to be cheapest, but other
+            # goal states may be reached at the same cost
+            goal_cost = cost
+            goals.append(current)
             continue
 
         for neighbor, edge_cost in next_states(current):
             tentative_cost = cost + edge_cost
-            if neighbor not in costs or tentative_cost <= costs[neighbor]:
+            neighbor_cost = costs.get(neighbor, inf)
+            if tentative_cost < neighbor_cost:
                 costs[neighbor] = tentative_cost
-                neighbor_path = path + [neighbor]
-                heappush(open_set, (tentative_cost, neighbor, neighbor_path))
+                predecessors[neighbor] = [current]
+                open_set.push(tentative_cost, neighbor)
+            elif tentative_cost == neighbor_cost:
+                # Another, equally good way to reach the neighbor
+                predecessors.setdefault(neighbor, []).append(current)
 
-    return paths_to_goal
+    return PathDag(start, goals, predecessors, goal_cost)
@@ -1,25 +1,54 @@
+from contextlib import redirect_stdout
+import copy
+from functools import cached_property, partial
 import importlib
-
-import aocd
-from aocd.models import Puzzle
+import io
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Iterable, NamedTuple
 
 from aoc import parsers
+from aoc.store import InputStore, StoredExample
 from aoc.types import PuzzlePart, Result
 
+if TYPE_CHECKING:
+    import aocd.types
+
 YEAR = 2024
+DAYS = range(1, 26)
 
 
-def aocd_part(part: PuzzlePart) -> aocd.types.PuzzlePart:
-    part_mapping: dict[PuzzlePart, aocd.types.PuzzlePart] = {1: "a", 2: "b"}
+def aocd_part(part: PuzzlePart) -> "aocd.types.PuzzlePart":
+    part_mapping: dict[PuzzlePart, "aocd.types.PuzzlePart"] = {1: "a", 2: "b"}
     return part_mapping[part]
 
 
+class PartReport(NamedTuple):
+    part: PuzzlePart
+    result: Result | None
+    parse_seconds: float
+    seconds: float
+
+
+class PartSolution(NamedTuple):
+    parser: Callable[[str], Any]
+    function: Callable[[Any], Result]
+    mutates_input: bool
+
+
+class PartSteps(NamedTuple):
+    parse: Callable[[], Any]
+    solve: Callable[[Any], Result]
+
+
 class Solver:
-    def __init__(self, day: int, example: bool = False):
+    def __init__(
+        self, day: int, example: bool = False, store: InputStore | None = None
+    ):
         self._day = day
-        self._puzzle = Puzzle(year=YEAR, day=self._day)
+        self._store = store if store else InputStore()
         self._solver_module = self._get_solver_module()
         self._example = example
+        self._parsed_inputs = dict[tuple[Callable[[str], Any], str], Any]()
 
     def solve_part(self, part: PuzzlePart, print_title: bool = True):
         if print_title:
@@ -33,8 +62,59 @@ class Solver:
         self.solve_part(part=1, print_title=False)
         self.solve_part(part=2, print_title=False)
 
+    def solve_timed(self, part: PuzzlePart):
+        """Solve a part, timing parsing and solving separately.
+
+        Parsed input is shared between the parts, so the parse time of part 2 is
+        usually just a cache lookup or a copy.
+        """
+        solution = self._get_solution(part)
+        if not solution:
+            return PartReport(part, None, 0.0, 0.0)
+
+        start = perf_counter()
+        parsed_input = self._parse_input(part, solution)
+        parsed = perf_counter()
+        result = solution.function(parsed_input)
+        return PartReport(part, result, parsed - start, perf_counter() - parsed)
+
+    def steps(self, part: PuzzlePart) -> PartSteps | None:
+        """Split a part into parsing and solving, with the input already read."""
+        solution = self._get_solution(part)
+        if not solution:
+            return None
+        raw_input = self._get_raw_input(part)
+        return PartSteps(partial(solution.parser, raw_input), solution.function)
+
+    def time_part(self, part: PuzzlePart) -> tuple[float, float] | None:
+        """Time parsing and solving a part, not counting reading the input."""
+        steps = self.steps(part)
+        if not steps:
+            return None
+
+        start = perf_counter()
+        parsed_input = steps.parse()
+        parsed = perf_counter()
+        steps.solve(parsed_input)
+        return parsed - start, perf_counter() - parsed
+
+    @cached_property
+    def _puzzle(self):
+        # Only created when the store can't answer, as aocd is slow to import
+        # and may need the network
+        from aocd.models import Puzzle
+
+        return Puzzle(year=YEAR, day=self._day)
+
     def _print_title(self):
-        print(f"Day {self._day} - {self._puzzle.title}")
+        print(f"Day {self._day} - {self._get_title()}")
+
+    def _get_title(self):
+        title = self._store.read_title(YEAR, self._day)
+        if title is None:
+            title = self._puzzle.title
+            self._store.save_title(YEAR, self._day, title)
+        return title
 
     def _handle_result(self, part: PuzzlePart, result: Result):
         print(f" - part {part}: {result}")
@@ -49,7 +129,23 @@ class Solver:
                     f"   That's not the right answer.  The correct answer is {example_answer}"
                 )
         else:
-            aocd.submit(answer=serialized_result, day=self._day, part=aocd_part(part))
+            answer = self._store.read_answer(YEAR, self._day, part)
+            if answer is None:
+                self._submit(part, serialized_result)
+            elif serialized_result == answer:
+                print("   That's the correct answer!")
+            else:
+                print(
+                    f"   That's not the right answer.  The correct answer is {answer}"
+                )
+
+    def _submit(self, part: PuzzlePart, answer: str):
+        import aocd
+
+        aocd.submit(answer=answer, day=self._day, part=aocd_part(part))
+        if self._puzzle.answered(aocd_part(part)):
+            correct_answer = getattr(self._puzzle, f"answer_{aocd_part(part)}")
+            self._store.save_answer(YEAR, self._day, part, correct_answer)
 
     def _get_example_answer(self, part: PuzzlePart):
         example = self._get_example(part)
@@ -59,27 +155,54 @@ class Solver:
             return example.answer_b
 
     def _solve(self, part: PuzzlePart) -> Result | None:
-        solver_function = self._get_solver_function(part)
-        if not solver_function:
+        solution = self._get_solution(part)
+        if not solution:
             return None
-        parsed_input = self._parse_input(part)
-        return solver_function(parsed_input)
+        parsed_input = self._parse_input(part, solution)
+        return solution.function(parsed_input)
 
-    def _parse_input(self, part: PuzzlePart):
-        parser = self._get_parser()
-        return parser(self._get_raw_input(part))
+    def _parse_input(self, part: PuzzlePart, solution: PartSolution):
+        raw_input = self._get_raw_input(part)
+        key = (solution.parser, raw_input)
+        if key not in self._parsed_inputs:
+            self._parsed_inputs[key] = solution.parser(raw_input)
+        parsed_input = self._parsed_inputs[key]
+
+        if solution.mutates_input:
+            # Keep the cached input intact for the other part
+            return copy.deepcopy(parsed_input)
+        return parsed_input
 
     def _get_raw_input(self, part: PuzzlePart):
         if self._example:
             example = self._get_example(part)
             return example.input_data
         else:
-            return self._puzzle.input_data
+            return self._puzzle_input
+
+    @cached_property
+    def _puzzle_input(self):
+        input_data = self._store.read_input(YEAR, self._day)
+        if input_data is None:
+            input_data = self._puzzle.input_data
+            self._store.save_input(YEAR, self._day, input_data)
+        return input_data
+
+    @cached_property
+    def _examples(self):
+        examples = self._store.read_examples(YEAR, self._day)
+        if examples is None:
+            examples = [
+                StoredExample(e.input_data, e.answer_a, e.answer_b)
+                for e in self._puzzle.examples
+            ]
+            self._store.save_examples(YEAR, self._day, examples)
+        return examples
 
     def _get_example(self, part: PuzzlePart):
-        return self._puzzle.examples[-1]
+        return self._examples[-1]
         required_attribute = f"answer_{aocd_part(part)}"
-        for example in self._puzzle.examples:
+        for example in self._examples:
             if getattr(example, required_attribute) is not None:
                 return example
         raise ValueError(f"Could not find any example for part {part}")
@@ -87,6 +210,23 @@ class Solver:
     def _get_parser(self):
         return getattr(self._solver_module, "parse", parsers.raw)
 
+    def _get_solution(self, part: PuzzlePart):
+        solver_function = self._get_solver_function(part)
+        if not solver_function:
+            return None
+
+        parser = self._get_parser()
+        transform_parser = getattr(solver_function, "parser", None)
+        if parser is parsers.raw and transform_parser:
+            # Parse on behalf of the transform wrapper, so the parsed input can be
+            # shared between the parts
+            return PartSolution(
+                transform_parser,
+                solver_function.__wrapped__,
+                solver_function.mutates_input,
+            )
+        return PartSolution(parser, solver_function, mutates_input=False)
+
     def _get_solver_function(self, part: PuzzlePart):
         part_name = f"part_{part}"
         return getattr(self._solver_module, part_name, None)
@@ -102,3 +242,55 @@ def solve(day: int, part: PuzzlePart | None, example: bool = False):
         solver.solve_part(part)
     else:
         solver.solve_all()
+
+
+def _solve_day_timed(day: int, example: bool):
+    # Days may print debug output while solving, which would garble the table
+    with redirect_stdout(io.StringIO()):
+        solver = Solver(day, example)
+        return [solver.solve_timed(part) for part in (1, 2)]
+
+
+def _format_part(report: PartReport):
+    if report.result is None:
+        return f"{'-':>20} {'':>9}"
+    return f"{report.result!s:>20} {report.seconds:>8.3f}s"
+
+
+def solve_days(days: Iterable[int], example: bool = False, jobs: int | None = None):
+    """Solve both parts of several days in parallel and print a summary table."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    start = perf_counter()
+    reports = dict[int, list[PartReport] | Exception]()
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {day: executor.submit(_solve_day_timed, day, example) for day in days}
+        for day, future in futures.items():
+            try:
+                reports[day] = future.result()
+            except Exception as error:
+                reports[day] = error
+
+    wall_time = perf_counter() - start
+
+    print(
+        f"{'Day':>3}  {'Parse':>9}  {'Part 1':>20} {'Time':>9}  "
+        f"{'Part 2':>20} {'Time':>9}"
+    )
+    solved = 0
+    total_time = 0.0
+    for day, report in reports.items():
+        if isinstance(report, Exception):
+            print(f"{day:>3}  error: {report!r}")
+            continue
+        solved += 1
+        part_1, part_2 = report
+        parse_time = part_1.parse_seconds + part_2.parse_seconds
+        total_time += parse_time + part_1.seconds + part_2.seconds
+        print(
+            f"{day:>3}  {parse_time:>8.3f}s  "
+            f"{_format_part(part_1)}  {_format_part(part_2)}"
+        )
+
+    print(f"Solved {solved} days in {wall_time:.3f}s ({total_time:.3f}s sequential)")
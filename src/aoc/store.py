@@ -0,0 +1,120 @@
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple
+
+from aoc.types import PuzzlePart
+
+STORE_ENV_VARIABLE = "AOC_INPUT_STORE"
+
+
+class StoredExample(NamedTuple):
+    input_data: str
+    answer_a: str | None
+    answer_b: str | None
+
+
+def default_root():
+    if root := os.environ.get(STORE_ENV_VARIABLE):
+        return Path(root)
+    return Path.home() / ".cache" / "aoc"
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}")
+    temp_path.write_bytes(data)
+    temp_path.replace(path)
+
+
+class InputStore:
+    """Local, content-addressed store for puzzle inputs, examples and answers.
+
+    Each (year, day, example index) key is a symlink to an object named by the
+    SHA-256 digest of its content, which is verified whenever it is read.
+    """
+
+    def __init__(self, root: Path | None = None):
+        self._root = root if root else default_root()
+
+    def read_input(self, year: int, day: int, example: int | None = None):
+        path = self._key_path(year, day, example)
+        try:
+            digest = Path(os.readlink(path)).name
+            with open(path, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if hashlib.sha256(data).hexdigest() != digest:
+                        return None
+                    return str(data, "utf-8")
+        except (OSError, ValueError):
+            # Missing key, dangling link or empty object
+            return None
+
+    def save_input(self, year: int, day: int, data: str, example: int | None = None):
+        raw_data = data.encode("utf-8")
+        digest = hashlib.sha256(raw_data).hexdigest()
+        object_path = self._root / "objects" / digest[:2] / digest
+        if not object_path.exists():
+            _write_atomic(object_path, raw_data)
+
+        path = self._key_path(year, day, example)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}")
+        temp_path.unlink(missing_ok=True)
+        temp_path.symlink_to(os.path.relpath(object_path, path.parent))
+        temp_path.replace(path)
+
+    def read_examples(self, year: int, day: int):
+        answers = self._read_metadata(year, day).get("examples")
+        if answers is None:
+            return None
+
+        examples = list[StoredExample]()
+        for index, (answer_a, answer_b) in enumerate(answers):
+            input_data = self.read_input(year, day, example=index)
+            if input_data is None:
+                return None
+            examples.append(StoredExample(input_data, answer_a, answer_b))
+        return examples
+
+    def save_examples(self, year: int, day: int, examples: Iterable[StoredExample]):
+        answers = list[tuple[str | None, str | None]]()
+        for index, example in enumerate(examples):
+            self.save_input(year, day, example.input_data, example=index)
+            answers.append((example.answer_a, example.answer_b))
+        self._update_metadata(year, day, examples=answers)
+
+    def read_title(self, year: int, day: int) -> str | None:
+        return self._read_metadata(year, day).get("title")
+
+    def save_title(self, year: int, day: int, title: str):
+        self._update_metadata(year, day, title=title)
+
+    def read_answer(self, year: int, day: int, part: PuzzlePart) -> str | None:
+        return self._read_metadata(year, day).get("answers", {}).get(str(part))
+
+    def save_answer(self, year: int, day: int, part: PuzzlePart, answer: str):
+        answers = self._read_metadata(year, day).get("answers", {})
+        answers[str(part)] = answer
+        self._update_metadata(year, day, answers=answers)
+
+    def _day_path(self, year: int, day: int):
+        return self._root / str(year) / f"{day:02}"
+
+    def _key_path(self, year: int, day: int, example: int | None):
+        name = "input" if example is None else f"example-{example}"
+        return self._day_path(year, day) / name
+
+    def _read_metadata(self, year: int, day: int) -> dict[str, Any]:
+        try:
+            return json.loads((self._day_path(year, day) / "meta.json").read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _update_metadata(self, year: int, day: int, **values: Any):
+        metadata = self._read_metadata(year, day)
+        metadata.update(values)
+        path = self._day_path(year, day) / "meta.json"
+        _write_atomic(path, json.dumps(metadata, indent=2).encode("utf-8"))
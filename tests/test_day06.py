@@ -0,0 +1,42 @@
+import importlib
+
+import pytest
+
+day06 = importlib.import_module("aoc.days.06")
+
+EXAMPLE = """\
+....#.....
+.........#
+..........
+..#.......
+.......#..
+..........
+.#..^.....
+........#.
+#.........
+......#..."""
+
+
+def test_example():
+    assert day06.part_1(EXAMPLE) == 41
+    assert day06.part_2(EXAMPLE) == 6
+
+
+@pytest.mark.parametrize("jobs", [2, 3])
+def test_pool_matches_inline(jobs: int):
+    patrol = day06.parse_patrol(EXAMPLE)
+    candidates = list(day06.candidate_obstacles(patrol))
+    assert day06.count_loops(patrol, candidates, jobs) == day06.count_loops(
+        patrol, candidates, jobs=1
+    )
+
+
+def test_part_2_jobs_from_environment(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(day06.JOBS_ENV_VARIABLE, "2")
+    assert day06.default_jobs() == 2
+    assert day06.part_2(EXAMPLE) == 6
+
+
+def test_no_candidates():
+    patrol = day06.parse_patrol("..^\n...\n")
+    assert day06.count_loops(patrol, [], jobs=2) == 0
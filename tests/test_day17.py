@@ -0,0 +1,74 @@
+import importlib
+import random
+
+import pytest
+
+day17 = importlib.import_module("aoc.days.17")
+Computer = day17.Computer
+compile_program = day17.compile_program
+
+
+def interpret(program: tuple[int, ...], a: int, b: int = 0, c: int = 0):
+    computer = Computer({"A": a, "B": b, "C": c}, program)
+    computer.run()
+    return computer.output()
+
+
+def random_program(rng: random.Random, length: int, max_steps: int):
+    """Make a random program, and registers it halts for within max_steps."""
+    while True:
+        program = list[int]()
+        for _ in range(length):
+            opcode = rng.randrange(8)
+            if opcode == day17.Opcode.jnz:
+                # Both forward and backward jumps, including off the end
+                operand = 2 * rng.randrange(length + 1)
+            elif opcode in (day17.Opcode.bxl, day17.Opcode.bxc):
+                operand = rng.randrange(8)
+            else:
+                operand = rng.randrange(7)
+            program.extend((opcode, operand))
+
+        registers = {"A": rng.randrange(1, 1 << 12), "B": rng.randrange(16), "C": 0}
+        computer = Computer(dict(registers), tuple(program))
+        for _ in range(max_steps):
+            if computer._instruction_pointer >= len(program):
+                return tuple(program), registers
+            if max(computer.registers.values()) > 1 << 16:
+                break
+            computer._process_instruction()
+
+
+@pytest.mark.parametrize(
+    "program, a",
+    [
+        ((0, 1, 5, 4, 3, 0), 729),
+        ((0, 3, 5, 4, 3, 0), 117440),
+        ((2, 4, 1, 1, 7, 5, 1, 5, 4, 0, 0, 3, 5, 5, 3, 0), 51064159),
+    ],
+)
+def test_compiled_examples(program: tuple[int, ...], a: int):
+    assert tuple(compile_program(program)(a, 0, 0)) == interpret(program, a)
+
+
+def test_compiled_quine():
+    program = (0, 3, 5, 4, 3, 0)
+    assert tuple(compile_program(program)(117440, 0, 0)) == program
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_compiled_random_programs(seed: int):
+    rng = random.Random(seed)
+    program, registers = random_program(rng, rng.randint(1, 8), max_steps=2000)
+    a, b, c = registers["A"], registers["B"], registers["C"]
+    assert tuple(compile_program(program)(a, b, c)) == interpret(program, a, b, c)
+
+
+def test_odd_jump_target():
+    with pytest.raises(ValueError):
+        compile_program((3, 1, 5, 4))
+
+
+def test_incomplete_instruction():
+    with pytest.raises(ValueError):
+        compile_program((0, 3, 5))